@@ -3,16 +3,23 @@ Workflow Engine Service using LangGraph for orchestrating complex decision trees
 """
 
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 import uuid
 
-from langchain.graphs import StateGraph
 from langchain.schema import BaseMessage
 from pydantic import BaseModel, Field
 
+# Timezone-aware replacement for the deprecated datetime.utcnow
+utcnow = partial(datetime.now, timezone.utc)
+
+def _new_id() -> str:
+    """Generate a new workflow/execution identifier."""
+    return str(uuid.uuid4())
+
 class WorkflowDefinition(BaseModel):
     """Workflow definition model."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_new_id)
     name: str
     description: Optional[str] = None
     version: int = 1
@@ -22,19 +29,19 @@ class WorkflowDefinition(BaseModel):
     variables: Dict[str, Any] = Field(default_factory=dict)
     owner: str
     tags: List[str] = Field(default_factory=list)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
     last_executed: Optional[datetime] = None
     execution_stats: Dict[str, Any] = Field(default_factory=dict)
 
 class WorkflowExecution(BaseModel):
     """Workflow execution instance model."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_new_id)
     workflow_id: str
     status: str = "PENDING"  # PENDING, RUNNING, COMPLETED, FAILED
     current_step: Optional[str] = None
     variables: Dict[str, Any] = Field(default_factory=dict)
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-    started_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime = Field(default_factory=utcnow)
     completed_at: Optional[datetime] = None
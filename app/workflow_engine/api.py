@@ -3,6 +3,8 @@ REST API endpoints for the Workflow Engine Service.
 """
 
 from typing import List, Optional, Dict, Any
+import logging
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from google.cloud import pubsub_v1
 
@@ -14,24 +16,46 @@ from .triggers import TriggerManager, WorkflowTrigger
 # Initialize router
 router = APIRouter(prefix="/api/v1")
 
-# Initialize services
+# Initialize services; these are process-wide singletons shared with the
+# GraphQL schema so gRPC channels are opened once and kept alive
 workflow_storage = WorkflowStorage(project_id="your-project-id")
-workflow_executor = WorkflowExecutor()
+workflow_executor = WorkflowExecutor(storage=workflow_storage)
 trigger_manager = TriggerManager()
 
-# Initialize Pub/Sub client
-publisher = pubsub_v1.PublisherClient()
+logger = logging.getLogger(__name__)
+
+# Initialize Pub/Sub client; events are batched client-side so bursts of
+# executions share a single publish RPC (flushed at latest every 10ms)
+publisher = pubsub_v1.PublisherClient(
+    batch_settings=pubsub_v1.types.BatchSettings(
+        max_messages=100,
+        max_bytes=1_000_000,
+        max_latency=0.01
+    ),
+    publisher_options=pubsub_v1.types.PublisherOptions(enable_message_ordering=False)
+)
 topic_path = publisher.topic_path("your-project-id", "workflow-events")
 
+def _on_publish_done(future):
+    """Log failed event publishes without blocking the request."""
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Failed to publish workflow event: %s", exc)
+
 @router.post("/workflows", response_model=WorkflowDefinition)
 async def create_workflow(workflow: WorkflowDefinition):
     """Create a new workflow definition."""
     try:
-        # Save workflow to Firestore
+        # Validate the trigger before anything is saved
+        trigger = WorkflowTrigger.model_validate(workflow.trigger)
+        
+        # Save workflow to Firestore; trigger registration is synchronous, so
+        # it runs after the save rather than alongside it
         workflow_id = await workflow_storage.save_workflow(workflow)
+        workflow_executor.invalidate_graph(workflow_id)
         
         # Register workflow triggers
-        trigger_manager.register_trigger(workflow_id, workflow.trigger)
+        trigger_manager.register_trigger(workflow_id, trigger)
         
         return workflow
     except Exception as e:
@@ -72,7 +96,8 @@ async def execute_workflow(
         background_tasks.add_task(
             workflow_executor.execute_workflow,
             workflow,
-            input_data
+            input_data,
+            execution
         )
         
         # Publish workflow.triggered event
@@ -81,7 +106,16 @@ async def execute_workflow(
             "execution_id": execution.id,
             "event": "workflow.triggered"
         }
-        publisher.publish(topic_path, str(event_data).encode())
+        # Routing fields are duplicated as message attributes so subscribers
+        # can filter server-side (e.g. attributes.event = "workflow.triggered")
+        future = publisher.publish(
+            topic_path,
+            orjson.dumps(event_data),
+            workflow_id=workflow_id,
+            execution_id=execution.id,
+            event="workflow.triggered"
+        )
+        future.add_done_callback(_on_publish_done)
         
         return {"execution_id": execution.id}
     except Exception as e:
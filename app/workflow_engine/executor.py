@@ -2,32 +2,77 @@
 Workflow executor using LangGraph for orchestrating workflow execution.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Callable, Dict, List, Optional, Any, Tuple
+from collections import OrderedDict, deque
 from datetime import datetime
+from functools import lru_cache
 import asyncio
 
-from langchain.graphs import StateGraph
+from langgraph.graph import StateGraph, START
 from langchain.schema import BaseMessage, SystemMessage, HumanMessage
 from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langgraph.checkpoint.memory import MemorySaver
 
-from . import WorkflowDefinition, WorkflowExecution
+from . import WorkflowDefinition, WorkflowExecution, utcnow
+from .storage import WorkflowStorage
+
+@lru_cache(maxsize=1024)
+def _build_prompt(system_prompt: str, human_prompt: str) -> ChatPromptTemplate:
+    """Build an AI decision prompt, shared by every step with the same text."""
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=system_prompt),
+        MessagesPlaceholder(variable_name="history"),
+        HumanMessage(content=human_prompt)
+    ])
+
+def _merge_variables(current: Dict[str, Any], update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply a step's output to the execution variables."""
+    return {**current, **(update or {})}
+
+# Graph state: the execution variables as one dict. Steps return the
+# variables they set, and updates from branches running in parallel are
+# merged rather than rejected as conflicting writes.
+ExecutionState = Annotated[Dict[str, Any], _merge_variables]
+
+# Compiled state graphs kept per (workflow id, version)
+MAX_CACHED_GRAPHS = 256
 
 class WorkflowExecutor:
     """Executes workflows using LangGraph for orchestration."""
     
-    def __init__(self, llm: Optional[ChatOpenAI] = None):
-        """Initialize workflow executor with optional LLM."""
+    def __init__(self, llm: Optional[ChatOpenAI] = None, storage: Optional[WorkflowStorage] = None):
+        """Initialize workflow executor with optional LLM and execution storage."""
         self.llm = llm or ChatOpenAI(temperature=0)
+        self.storage = storage
+        # Intermediate step state lives in the in-process checkpointer; only
+        # the final execution record is written to storage
+        self._checkpointer = MemorySaver()
+        self._graph_cache: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
         
-    async def execute_workflow(self, workflow: WorkflowDefinition, input_data: Dict[str, Any]) -> WorkflowExecution:
+    async def execute_workflow(
+        self,
+        workflow: WorkflowDefinition,
+        input_data: Dict[str, Any],
+        execution: Optional[WorkflowExecution] = None
+    ) -> WorkflowExecution:
         """Execute a workflow using LangGraph."""
         # Create workflow execution instance
-        execution = WorkflowExecution(workflow_id=workflow.id)
+        execution = execution or WorkflowExecution(workflow_id=workflow.id)
         
         try:
-            # Initialize state graph
-            workflow_graph = await self._build_state_graph(workflow)
+            # Reuse the compiled graph for this workflow version
+            key = (workflow.id, workflow.version)
+            workflow_graph = self._graph_cache.get(key)
+            if workflow_graph is None:
+                state_graph = await self._build_state_graph(workflow)
+                workflow_graph = state_graph.compile(checkpointer=self._checkpointer)
+                self._graph_cache[key] = workflow_graph
+                # Evict the least recently used graph past the cache bound
+                if len(self._graph_cache) > MAX_CACHED_GRAPHS:
+                    self._graph_cache.popitem(last=False)
+            else:
+                self._graph_cache.move_to_end(key)
             
             # Initialize execution variables
             variables = {
@@ -35,71 +80,146 @@ class WorkflowExecutor:
                 **input_data,
                 "execution_id": execution.id,
                 "workflow_id": workflow.id,
-                "start_time": datetime.utcnow().isoformat()
+                "start_time": utcnow().isoformat()
             }
             
             # Execute workflow graph
             execution.status = "RUNNING"
-            result = await workflow_graph.arun(variables)
+            # Stream events so independent branches run concurrently and the
+            # currently executing step is tracked as it happens
+            result = None
+            async for event in workflow_graph.astream_events(
+                variables,
+                config={"configurable": {"thread_id": execution.id}},
+                version="v2"
+            ):
+                node = event.get("metadata", {}).get("langgraph_node")
+                if event["event"] == "on_chain_start" and node:
+                    execution.current_step = node
+                elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                    result = event["data"].get("output")
             
             # Update execution status
             execution.status = "COMPLETED"
             execution.result = result
-            execution.completed_at = datetime.utcnow()
+            execution.completed_at = utcnow()
             
         except Exception as e:
             execution.status = "FAILED"
             execution.error = str(e)
-            execution.completed_at = datetime.utcnow()
+            execution.completed_at = utcnow()
+            
+        # Persist the final execution state in a single write, then drop the
+        # run's checkpoints so the in-process saver does not grow per execution
+        try:
+            if self.storage is not None:
+                await self.storage.save_execution(execution)
+        finally:
+            await self._checkpointer.adelete_thread(execution.id)
             
         return execution
     
+    def invalidate_graph(self, workflow_id: str):
+        """Drop cached state graphs for every version of a workflow."""
+        for key in [key for key in self._graph_cache if key[0] == workflow_id]:
+            del self._graph_cache[key]
+    
     async def _build_state_graph(self, workflow: WorkflowDefinition) -> StateGraph:
         """Build LangGraph state graph from workflow definition."""
         # Initialize state graph
-        workflow_graph = StateGraph()
+        workflow_graph = StateGraph(ExecutionState)
         
-        # Add nodes for each step
-        for step in workflow.steps:
-            step_id = step["id"]
-            step_type = step["type"]
-            
-            # Create step node
-            workflow_graph.add_node(step_id, self._create_step_node(step))
-            
-            # Add edges based on next steps
-            for next_step in step.get("next_steps", []):
-                workflow_graph.add_edge(step_id, next_step)
+        # Adjacency and reverse adjacency in a single pass over the steps
+        steps_by_id = {step["id"]: step for step in workflow.steps}
+        adjacency = {step_id: step.get("next_steps", []) for step_id, step in steps_by_id.items()}
+        parents: Dict[str, List[str]] = {step_id: [] for step_id in steps_by_id}
+        for step_id, next_steps in adjacency.items():
+            for next_step in next_steps:
+                if next_step not in parents:
+                    raise ValueError(f"Step '{step_id}' references unknown step '{next_step}'")
+                parents[next_step].append(step_id)
+        
+        # Register nodes in topological order (Kahn's algorithm). A step with
+        # several parents waits for all of them, so a step inside a loop would
+        # wait on its own back-edge and never run; loops are rejected instead
+        in_degree = {step_id: len(step_parents) for step_id, step_parents in parents.items()}
+        ready = deque(step_id for step_id, degree in in_degree.items() if degree == 0)
+        order: List[str] = []
+        while ready:
+            step_id = ready.popleft()
+            order.append(step_id)
+            for next_step in adjacency[step_id]:
+                in_degree[next_step] -= 1
+                if in_degree[next_step] == 0:
+                    ready.append(next_step)
+        if len(order) < len(steps_by_id):
+            placed = set(order)
+            unordered = ", ".join(step_id for step_id in steps_by_id if step_id not in placed)
+            raise ValueError(f"Workflow steps form a loop; cannot order: {unordered}")
+        
+        for step_id in order:
+            workflow_graph.add_node(step_id, self._create_step_node(steps_by_id[step_id]))
+        
+        # Root steps start in parallel; a step with several parents joins on
+        # all of them, while its siblings fan out concurrently
+        for step_id in order:
+            step_parents = parents[step_id]
+            if not step_parents:
+                workflow_graph.add_edge(START, step_id)
+            elif len(step_parents) == 1:
+                workflow_graph.add_edge(step_parents[0], step_id)
+            else:
+                workflow_graph.add_edge(step_parents, step_id)
         
         return workflow_graph
     
     def _create_step_node(self, step: Dict[str, Any]) -> Any:
         """Create appropriate node handler based on step type."""
-        step_type = step["type"]
-        step_config = step.get("config", {})
-        
-        if step_type == "AI_DECISION":
-            # Create AI decision node
-            prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content=step_config.get("system_prompt", "")),
-                MessagesPlaceholder(variable_name="history"),
-                HumanMessage(content=step_config.get("human_prompt", ""))
-            ])
-            
-            return {
-                "prompt": prompt,
-                "llm": self.llm,
-                "input_variables": step_config.get("input_variables", [])
-            }
-            
-        elif step_type == "SEND_EMAIL":
-            # Create email sending node
-            return {
-                "template": step_config.get("template"),
-                "recipients": step_config.get("recipients", []),
-                "subject": step_config.get("subject")
-            }
-            
-        # Add more step type handlers as needed
-        
-        return step_config
+        handler = STEP_HANDLERS.get(step["type"], _build_default_node)
+        node = handler(step.get("config", {}), self)
+        # Handlers may return a step specification rather than a runnable;
+        # such a step cannot run, so the execution fails instead of skipping it
+        if not callable(node):
+            raise ValueError(
+                f"Step '{step['id']}' of type '{step['type']}' has no executable handler"
+            )
+        return node
+
+StepHandler = Callable[[Dict[str, Any], WorkflowExecutor], Any]
+
+# Step type -> node factory; add new step types with @register_step
+STEP_HANDLERS: Dict[str, StepHandler] = {}
+
+def register_step(step_type: str) -> Callable[[StepHandler], StepHandler]:
+    """Register a node factory for a workflow step type."""
+    def decorator(handler: StepHandler) -> StepHandler:
+        STEP_HANDLERS[step_type] = handler
+        return handler
+    return decorator
+
+@register_step("AI_DECISION")
+def _build_ai_decision_node(step_config: Dict[str, Any], executor: WorkflowExecutor) -> Any:
+    """Create AI decision node."""
+    prompt = _build_prompt(
+        step_config.get("system_prompt", ""),
+        step_config.get("human_prompt", "")
+    )
+    
+    return {
+        "prompt": prompt,
+        "llm": executor.llm,
+        "input_variables": step_config.get("input_variables", [])
+    }
+
+@register_step("SEND_EMAIL")
+def _build_email_node(step_config: Dict[str, Any], executor: WorkflowExecutor) -> Any:
+    """Create email sending node."""
+    return {
+        "template": step_config.get("template"),
+        "recipients": step_config.get("recipients", []),
+        "subject": step_config.get("subject")
+    }
+
+def _build_default_node(step_config: Dict[str, Any], executor: WorkflowExecutor) -> Any:
+    """Fallback for step types without a dedicated handler."""
+    return step_config
@@ -2,16 +2,15 @@
 GraphQL schema and resolvers for workflow management.
 """
 
+import orjson
 import strawberry
-from typing import List, Optional
+from typing import Any, List, Optional
 from datetime import datetime
 from uuid import UUID
 
 from . import WorkflowDefinition, WorkflowExecution, WorkflowTrigger
-from .storage import WorkflowStorage
-
-# Initialize storage
-workflow_storage = WorkflowStorage(project_id="your-project-id")
+# Share the REST API's storage so the service holds one Firestore channel
+from .api import workflow_executor, workflow_storage
 
 @strawberry.type
 class WorkflowStep:
@@ -60,43 +59,81 @@ class WorkflowInput:
     owner: str
     tags: List[str]
 
+def _dumps(value: Any) -> str:
+    """Pack a JSON value into one of the string-typed GraphQL fields."""
+    return orjson.dumps(value).decode()
+
+def _to_workflow(workflow: WorkflowDefinition) -> Workflow:
+    """Convert a stored workflow definition to its GraphQL type."""
+    data = workflow.model_dump()
+    data["trigger"] = _dumps(data["trigger"])
+    data["variables"] = _dumps(data["variables"])
+    data["execution_stats"] = _dumps(data["execution_stats"])
+    data["steps"] = [
+        WorkflowStep(
+            id=step["id"],
+            name=step.get("name", step["id"]),
+            type=step["type"],
+            config=_dumps(step.get("config", {})),
+            next_steps=step.get("next_steps", [])
+        )
+        for step in data["steps"]
+    ]
+    return Workflow(**data)
+
+def _to_execution_status(execution: WorkflowExecution) -> WorkflowExecutionStatus:
+    """Convert a stored workflow execution to its GraphQL type."""
+    data = execution.model_dump()
+    data["variables"] = _dumps(data["variables"])
+    if data["result"] is not None:
+        data["result"] = _dumps(data["result"])
+    return WorkflowExecutionStatus(**data)
+
 @strawberry.type
 class Query:
     @strawberry.field
     async def workflow(self, id: UUID) -> Optional[Workflow]:
         """Get a specific workflow by ID."""
         workflow = await workflow_storage.get_workflow(str(id))
-        return Workflow(**workflow.dict()) if workflow else None
+        return _to_workflow(workflow) if workflow else None
 
     @strawberry.field
     async def workflows(
         self,
         active_only: bool = True,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[str] = None
     ) -> List[Workflow]:
-        """List workflows with optional filtering."""
-        workflows = await workflow_storage.list_workflows(active_only=active_only)
-        return [Workflow(**w.dict()) for w in workflows[:limit]]
+        """List workflows with optional filtering; pass the last ID seen as `after` to page."""
+        workflows = await workflow_storage.list_workflows(
+            active_only=active_only,
+            limit=limit,
+            start_after=after
+        )
+        return [_to_workflow(w) for w in workflows]
 
     @strawberry.field
     async def workflow_execution(self, id: UUID) -> Optional[WorkflowExecutionStatus]:
         """Get a specific workflow execution by ID."""
         execution = await workflow_storage.get_execution(str(id))
-        return WorkflowExecutionStatus(**execution.dict()) if execution else None
+        return _to_execution_status(execution) if execution else None
 
     @strawberry.field
     async def workflow_executions(
         self,
         workflow_id: Optional[UUID] = None,
         status: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        after: Optional[str] = None
     ) -> List[WorkflowExecutionStatus]:
-        """List workflow executions with optional filtering."""
+        """List workflow executions with optional filtering; pass the last ID seen as `after` to page."""
         executions = await workflow_storage.list_executions(
             workflow_id=str(workflow_id) if workflow_id else None,
-            status=status
+            status=status,
+            limit=limit,
+            start_after=after
         )
-        return [WorkflowExecutionStatus(**e.dict()) for e in executions[:limit]]
+        return [_to_execution_status(e) for e in executions]
 
 @strawberry.type
 class Mutation:
@@ -106,14 +143,14 @@ class Mutation:
         workflow = WorkflowDefinition(
             name=input.name,
             description=input.description,
-            trigger=input.trigger,
-            steps=input.steps,
-            variables=input.variables,
+            trigger=orjson.loads(input.trigger),
+            steps=[orjson.loads(step) for step in input.steps],
+            variables=orjson.loads(input.variables),
             owner=input.owner,
             tags=input.tags
         )
         await workflow_storage.save_workflow(workflow)
-        return Workflow(**workflow.dict())
+        return _to_workflow(workflow)
 
     @strawberry.mutation
     async def update_workflow(self, id: UUID, input: WorkflowInput) -> Workflow:
@@ -126,15 +163,16 @@ class Mutation:
             id=str(id),
             name=input.name,
             description=input.description,
-            trigger=input.trigger,
-            steps=input.steps,
-            variables=input.variables,
+            trigger=orjson.loads(input.trigger),
+            steps=[orjson.loads(step) for step in input.steps],
+            variables=orjson.loads(input.variables),
             owner=input.owner,
             tags=input.tags,
             version=existing.version + 1
         )
         await workflow_storage.save_workflow(workflow)
-        return Workflow(**workflow.dict())
+        workflow_executor.invalidate_graph(workflow.id)
+        return _to_workflow(workflow)
 
 @strawberry.type
 class Subscription:
@@ -142,7 +180,7 @@ class Subscription:
     async def workflow_status(self, execution_id: UUID) -> WorkflowExecutionStatus:
         """Subscribe to workflow execution status updates."""
         async for execution in workflow_storage.watch_execution(str(execution_id)):
-            yield WorkflowExecutionStatus(**execution.dict())
+            yield _to_execution_status(execution)
 
 schema = strawberry.Schema(
     query=Query,
@@ -3,10 +3,11 @@ Main FastAPI application for the Workflow Engine Service.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from strawberry.fastapi import GraphQLRouter
 from contextlib import asynccontextmanager
 
-from .api import router as rest_router
+from .api import router as rest_router, workflow_storage
 from .graphql import schema
 
 @asynccontextmanager
@@ -17,13 +18,15 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("Shutting down Workflow Engine Service...")
+    await workflow_storage.flush()
 
 # Create FastAPI app
 app = FastAPI(
     title="Workflow Engine Service",
     description="Intelligent automation using LangGraph for complex decision trees and workflow orchestration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add REST API router
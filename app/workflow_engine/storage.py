@@ -2,11 +2,23 @@
 Storage interface for workflow state persistence using Firestore.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import asyncio
+import logging
 
 from google.cloud import firestore
-from . import WorkflowDefinition, WorkflowExecution
+from . import WorkflowDefinition, WorkflowExecution, utcnow
+
+# Firestore rejects write batches with more than 500 mutations
+MAX_BATCH_SIZE = 500
+# Upper bound on how long a buffered write may wait before being committed
+MAX_BATCH_LATENCY = 0.01
+# Retry delays for writes that failed to commit, doubling up to the maximum
+MIN_RETRY_DELAY = 0.1
+MAX_RETRY_DELAY = 30.0
+
+logger = logging.getLogger(__name__)
 
 class WorkflowStorage:
     """Storage interface for workflow state persistence."""
@@ -16,68 +28,220 @@ class WorkflowStorage:
         self.db = firestore.Client(project=project_id)
         self.workflows_collection = self.db.collection('workflows')
         self.executions_collection = self.db.collection('workflow_executions')
+        self._batch_queue: List[Tuple[firestore.DocumentReference, Dict[str, Any]]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._retry_delay = 0.0
+        # Flushes run one at a time so writes are committed in order
+        self._flush_lock = asyncio.Lock()
+        
+    async def _enqueue(self, ref: firestore.DocumentReference, payload: Dict[str, Any]):
+        """Buffer a document write, committing once the batch is full or stale."""
+        self._batch_queue.append((ref, payload))
+        if len(self._batch_queue) >= MAX_BATCH_SIZE:
+            await self.flush()
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(MAX_BATCH_LATENCY, self._start_background_flush)
+            
+    def _start_background_flush(self):
+        """Timer callback committing stale buffered writes in a task."""
+        self._flush_handle = None
+        self._flush_task = asyncio.get_running_loop().create_task(self._background_flush())
+        
+    async def _background_flush(self):
+        """Flush without a caller to report to; failed writes stay queued."""
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.error(
+                "Failed to commit buffered writes, retrying in %.1fs: %s", self._retry_delay, exc
+            )
+            
+    def _schedule_retry(self):
+        """Arm a flush for writes that failed to commit, backing off on repeated failures."""
+        self._retry_delay = min(max(self._retry_delay * 2, MIN_RETRY_DELAY), MAX_RETRY_DELAY)
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(self._retry_delay, self._start_background_flush)
+            
+    async def flush(self):
+        """Commit all buffered writes in chunks of at most MAX_BATCH_SIZE.
+        
+        Commits run in a worker thread. Writes that fail to commit are put
+        back at the front of the queue, a retry is scheduled so they are
+        committed even if nothing else flushes, and the error is raised to
+        the caller.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            
+        async with self._flush_lock:
+            pending, self._batch_queue = self._batch_queue, []
+            for start in range(0, len(pending), MAX_BATCH_SIZE):
+                batch = self.db.batch()
+                for ref, payload in pending[start:start + MAX_BATCH_SIZE]:
+                    batch.set(ref, payload)
+                try:
+                    await asyncio.to_thread(batch.commit)
+                except BaseException:
+                    # Ahead of anything buffered while this flush was running
+                    self._batch_queue = pending[start:] + self._batch_queue
+                    self._schedule_retry()
+                    raise
+            self._retry_delay = 0.0
+        
+    def _paginate(self, query, collection, order_field: str, limit: Optional[int], start_after: Optional[str]):
+        """Push ordering, limit and an ID-based cursor down into a Firestore query."""
+        if limit is None and start_after is None:
+            return query
+            
+        query = query.order_by(order_field, direction=firestore.Query.DESCENDING)
+        if start_after is not None:
+            cursor = collection.document(start_after).get()
+            if cursor.exists:
+                query = query.start_after(cursor)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
         
     async def save_workflow(self, workflow: WorkflowDefinition) -> str:
         """Save workflow definition to Firestore."""
         workflow_ref = self.workflows_collection.document(workflow.id)
-        workflow_ref.set(workflow.dict())
+        await self._enqueue(workflow_ref, workflow.model_dump())
         return workflow.id
         
+    async def save_workflow_bulk(self, workflows: List[WorkflowDefinition]) -> List[str]:
+        """Save many workflow definitions using batched commits."""
+        for workflow in workflows:
+            await self._enqueue(self.workflows_collection.document(workflow.id), workflow.model_dump())
+        await self.flush()
+        return [workflow.id for workflow in workflows]
+        
     async def get_workflow(self, workflow_id: str) -> Optional[WorkflowDefinition]:
         """Retrieve workflow definition from Firestore."""
+        await self.flush()
         workflow_ref = self.workflows_collection.document(workflow_id)
-        workflow_doc = workflow_ref.get()
+        workflow_doc = await asyncio.to_thread(workflow_ref.get)
         
         if workflow_doc.exists:
             return WorkflowDefinition(**workflow_doc.to_dict())
         return None
         
-    async def list_workflows(self, active_only: bool = True) -> List[WorkflowDefinition]:
-        """List workflow definitions from Firestore."""
+    async def list_workflows(
+        self,
+        active_only: bool = True,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None
+    ) -> List[WorkflowDefinition]:
+        """List workflow definitions from Firestore, newest first when paginated."""
+        await self.flush()
+        return await asyncio.to_thread(self._list_workflows_sync, active_only, limit, start_after)
+        
+    def _list_workflows_sync(
+        self,
+        active_only: bool,
+        limit: Optional[int],
+        start_after: Optional[str]
+    ) -> List[WorkflowDefinition]:
+        """Stream workflow documents; runs in a worker thread."""
         query = self.workflows_collection
         if active_only:
             query = query.where('is_active', '==', True)
+        query = self._paginate(query, self.workflows_collection, 'updated_at', limit, start_after)
             
-        workflows = []
-        for doc in query.stream():
-            workflows.append(WorkflowDefinition(**doc.to_dict()))
-        return workflows
+        return [WorkflowDefinition(**doc.to_dict()) for doc in query.stream()]
+        
+    async def get_workflows(self, workflow_ids: List[str]) -> List[WorkflowDefinition]:
+        """Retrieve several workflow definitions in a single batched read."""
+        await self.flush()
+        refs = [self.workflows_collection.document(workflow_id) for workflow_id in workflow_ids]
+        docs = await asyncio.to_thread(lambda: list(self.db.get_all(refs)))
+        return [WorkflowDefinition(**doc.to_dict()) for doc in docs if doc.exists]
         
     async def save_execution(self, execution: WorkflowExecution) -> str:
         """Save workflow execution state to Firestore."""
         execution_ref = self.executions_collection.document(execution.id)
-        execution_ref.set(execution.dict())
+        await self._enqueue(execution_ref, execution.model_dump())
         return execution.id
         
     async def get_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
         """Retrieve workflow execution state from Firestore."""
+        await self.flush()
         execution_ref = self.executions_collection.document(execution_id)
-        execution_doc = execution_ref.get()
+        execution_doc = await asyncio.to_thread(execution_ref.get)
         
         if execution_doc.exists:
             return WorkflowExecution(**execution_doc.to_dict())
         return None
         
-    async def list_executions(self, workflow_id: Optional[str] = None, status: Optional[str] = None) -> List[WorkflowExecution]:
-        """List workflow executions from Firestore."""
+    async def list_executions(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None
+    ) -> List[WorkflowExecution]:
+        """List workflow executions from Firestore, newest first when paginated."""
+        await self.flush()
+        return await asyncio.to_thread(self._list_executions_sync, workflow_id, status, limit, start_after)
+        
+    def _list_executions_sync(
+        self,
+        workflow_id: Optional[str],
+        status: Optional[str],
+        limit: Optional[int],
+        start_after: Optional[str]
+    ) -> List[WorkflowExecution]:
+        """Stream execution documents; runs in a worker thread."""
         query = self.executions_collection
         
         if workflow_id:
             query = query.where('workflow_id', '==', workflow_id)
         if status:
             query = query.where('status', '==', status)
+        query = self._paginate(query, self.executions_collection, 'started_at', limit, start_after)
             
-        executions = []
-        for doc in query.stream():
-            executions.append(WorkflowExecution(**doc.to_dict()))
-        return executions
+        return [WorkflowExecution(**doc.to_dict()) for doc in query.stream()]
+        
+    async def get_executions(self, execution_ids: List[str]) -> List[WorkflowExecution]:
+        """Retrieve several workflow executions in a single batched read."""
+        await self.flush()
+        refs = [self.executions_collection.document(execution_id) for execution_id in execution_ids]
+        docs = await asyncio.to_thread(lambda: list(self.db.get_all(refs)))
+        return [WorkflowExecution(**doc.to_dict()) for doc in docs if doc.exists]
+        
+    async def watch_execution(self, execution_id: str) -> AsyncIterator[WorkflowExecution]:
+        """Yield the execution each time Firestore reports a change to it."""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        def on_snapshot(doc_snapshots, changes, read_time):
+            # Called on Firestore's listener thread; hand off to the event loop
+            for doc in doc_snapshots:
+                if doc.exists:
+                    loop.call_soon_threadsafe(queue.put_nowait, doc.to_dict())
+                    
+        watch = self.executions_collection.document(execution_id).on_snapshot(on_snapshot)
+        try:
+            while True:
+                execution = WorkflowExecution(**(await queue.get()))
+                yield execution
+                if execution.status in ("COMPLETED", "FAILED"):
+                    break
+        finally:
+            watch.unsubscribe()
         
     async def update_execution_status(self, execution_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
         """Update workflow execution status."""
+        await self.flush()
         execution_ref = self.executions_collection.document(execution_id)
         update_data = {
             'status': status,
-            'completed_at': datetime.utcnow()
+            'completed_at': utcnow()
         }
         
         if result is not None:
@@ -85,4 +249,4 @@ class WorkflowStorage:
         if error is not None:
             update_data['error'] = error
             
-        execution_ref.update(update_data)
+        await asyncio.to_thread(execution_ref.update, update_data)
@@ -2,9 +2,11 @@
 Workflow trigger management for handling workflow execution triggers.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from collections import defaultdict
 from datetime import datetime
 import asyncio
+import operator
 from enum import Enum
 
 from pydantic import BaseModel, Field
@@ -24,6 +26,21 @@ class TriggerCondition(BaseModel):
     operator: str  # equals, not_equals, greater_than, less_than, contains
     value: Any
 
+# Operator name -> predicate(field_value, condition_value)
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "equals": operator.eq,
+    "not_equals": operator.ne,
+    "greater_than": operator.gt,
+    "less_than": operator.lt,
+    "contains": lambda field_value, value: value in field_value,
+}
+
+def _always(field_value: Any, value: Any) -> bool:
+    """Predicate used for unknown operators, which never reject an event."""
+    return True
+
+CompiledCondition = Tuple[str, Callable[[Any, Any], bool], Any]
+
 class WorkflowTrigger(BaseModel):
     """Workflow trigger configuration."""
     type: TriggerType
@@ -36,6 +53,7 @@ class TriggerManager:
     def __init__(self):
         """Initialize trigger manager."""
         self._triggers: Dict[str, List[WorkflowTrigger]] = {}
+        self._by_type: Dict[TriggerType, List[Tuple[str, List[CompiledCondition]]]] = defaultdict(list)
         self._event_handlers: Dict[TriggerType, List[callable]] = {}
         
     def register_trigger(self, workflow_id: str, trigger: WorkflowTrigger):
@@ -43,6 +61,9 @@ class TriggerManager:
         if workflow_id not in self._triggers:
             self._triggers[workflow_id] = []
         self._triggers[workflow_id].append(trigger)
+        self._by_type[trigger.type].append(
+            (workflow_id, self._compile_conditions(trigger.conditions))
+        )
         
     def register_event_handler(self, trigger_type: TriggerType, handler: callable):
         """Register event handler for trigger type."""
@@ -55,12 +76,10 @@ class TriggerManager:
         matching_workflows = []
         
         # Find workflows with matching triggers
-        for workflow_id, triggers in self._triggers.items():
-            for trigger in triggers:
-                if trigger.type == trigger_type:
-                    # Check if conditions are met
-                    if self._evaluate_conditions(trigger.conditions, event_data):
-                        matching_workflows.append(workflow_id)
+        for workflow_id, conditions in self._by_type.get(trigger_type, ()):
+            # Check if conditions are met
+            if self._evaluate_conditions(conditions, event_data):
+                matching_workflows.append(workflow_id)
                         
         # Execute event handlers for matching workflows
         if trigger_type in self._event_handlers:
@@ -68,23 +87,19 @@ class TriggerManager:
                 for workflow_id in matching_workflows:
                     await handler(workflow_id, event_data)
                     
-    def _evaluate_conditions(self, conditions: List[TriggerCondition], event_data: Dict[str, Any]) -> bool:
+    def _compile_conditions(self, conditions: List[TriggerCondition]) -> List[CompiledCondition]:
+        """Resolve condition operators to predicates once, at registration time."""
+        return [
+            (condition.field, _OPS.get(condition.operator, _always), condition.value)
+            for condition in conditions
+        ]
+        
+    def _evaluate_conditions(self, conditions: List[CompiledCondition], event_data: Dict[str, Any]) -> bool:
         """Evaluate if all conditions are met for event data."""
-        for condition in conditions:
-            field_value = event_data.get(condition.field)
+        for field, predicate, value in conditions:
+            field_value = event_data.get(field)
             
-            if field_value is None:
-                return False
-                
-            if condition.operator == "equals" and field_value != condition.value:
-                return False
-            elif condition.operator == "not_equals" and field_value == condition.value:
-                return False
-            elif condition.operator == "greater_than" and field_value <= condition.value:
-                return False
-            elif condition.operator == "less_than" and field_value >= condition.value:
-                return False
-            elif condition.operator == "contains" and condition.value not in field_value:
+            if field_value is None or not predicate(field_value, value):
                 return False
                 
         return True
@@ -2,63 +2,104 @@
 """Create admin user script."""
 
 import asyncio
+import os
 import uuid
 from datetime import datetime
+from typing import Any, Dict, List
 
 import asyncpg
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
+INSERT_USER_QUERY = """INSERT INTO users (id, email, first_name, last_name, hashed_password,
+   is_active, is_superuser, email_verified, created_at, updated_at)
+   VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)"""
+
+ADMIN_USERS = [
+    {
+        'email': 'admin@example.com',
+        'first_name': 'Admin',
+        'last_name': 'User',
+        'password': 'password',
+        'is_superuser': True
+    }
+]
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash passwords in worker threads, at most one per CPU at a time."""
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(pwd_context.hash, password)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+async def create_users(pool: asyncpg.Pool, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Create the given users, skipping emails that already exist."""
+    async with pool.acquire() as conn:
+        existing = await conn.fetch(
+            "SELECT email FROM users WHERE email = ANY($1::text[])",
+            [user['email'] for user in users]
+        )
+    existing_emails = {record['email'] for record in existing}
+
+    new_users = [user for user in users if user['email'] not in existing_emails]
+    if not new_users:
+        return []
+
+    hashed_passwords = await hash_passwords([user['password'] for user in new_users])
+    now = datetime.utcnow()
+    rows = [
+        (
+            str(uuid.uuid4()),
+            user['email'],
+            user['first_name'],
+            user['last_name'],
+            hashed_password,
+            True,
+            user.get('is_superuser', False),
+            True,
+            now,
+            now
+        )
+        for user, hashed_password in zip(new_users, hashed_passwords)
+    ]
+
+    # Single prepared statement, one bind per user
+    async with pool.acquire() as conn:
+        await conn.executemany(INSERT_USER_QUERY, rows)
+
+    return new_users
+
 async def create_admin():
     """Create admin user."""
     # Connect directly to PostgreSQL
-    conn = await asyncpg.connect(
+    pool = await asyncpg.create_pool(
         host='localhost',
         port=5434,  # User management postgres port
         database='user_management',
         user='user_management_user',
-        password='user_management_password'
+        password='user_management_password',
+        min_size=1,
+        max_size=4
     )
-    
+
     try:
-        # Check if admin user exists
-        existing_user = await conn.fetchrow(
-            "SELECT id FROM users WHERE email = $1", 
-            'admin@example.com'
-        )
-        
-        if existing_user:
+        created = await create_users(pool, ADMIN_USERS)
+
+        if not created:
             print('Admin user already exists!')
             return
-            
-        # Create admin user
-        hashed_password = pwd_context.hash('password')
-        user_id = str(uuid.uuid4())
-        now = datetime.utcnow()
-        
-        await conn.execute(
-            """INSERT INTO users (id, email, first_name, last_name, hashed_password, 
-               is_active, is_superuser, email_verified, created_at, updated_at)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)""",
-            user_id,
-            'admin@example.com',
-            'Admin',
-            'User', 
-            hashed_password,
-            True,
-            True,
-            True,
-            now,
-            now
-        )
-        
+
         print('✅ Admin user created successfully!')
-        print('Email: admin@example.com')
-        print('Password: password')
-        
+        for user in created:
+            print(f"Email: {user['email']}")
+            print(f"Password: {user['password']}")
+
     finally:
-        await conn.close()
+        await pool.close()
 
 if __name__ == "__main__":
     asyncio.run(create_admin())
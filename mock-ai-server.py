@@ -3,166 +3,271 @@
 Simple mock AI orchestration server for testing frontend integration
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import os
+import time
 import uuid
 import datetime
 import urllib.parse
+from functools import lru_cache
+
+import orjson
+
+# Datetimes are passed to orjson as-is and rendered as UTC ISO strings
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# CORS headers never change, so the fixed part of each response head is
+# encoded once
+CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type\r\n'
+)
+JSON_HEAD = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n' + CORS_HEADERS
+NDJSON_HEAD = b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n' + CORS_HEADERS
+
+# Static parts of the mock rows; only ids and timestamps vary per request
+MODEL_ROWS = (
+    {
+        "name": "Lead Scoring Model",
+        "type": "classification",
+        "status": "active",
+        "accuracy": 0.89,
+        "version": "v1.2"
+    },
+    {
+        "name": "Customer Segmentation",
+        "type": "clustering",
+        "status": "training",
+        "accuracy": 0.76,
+        "version": "v2.1"
+    }
+)
+
+PREDICTION_JOB_ROW = {
+    "status": "completed",
+    "total_items": 100,
+    "completed_items": 100,
+    "failed_items": 0,
+    "progress": 100.0
+}
+
+TRAINING_JOB_ROW = {
+    "model_name": "Customer Churn Predictor",
+    "algorithm": "random_forest",
+    "status": "running",
+    "progress": 67.5,
+    "metrics": {
+        "accuracy": 0.84,
+        "loss": 0.23,
+        "validation_accuracy": 0.81,
+        "validation_loss": 0.28
+    }
+}
+
+WORKFLOW_ROW = {
+    "name": "Lead Scoring Pipeline",
+    "description": "Automated lead scoring and routing workflow",
+    "status": "active",
+    "type": "ml_pipeline",
+    "steps": 5,
+    "success_rate": 0.94
+}
+
+
+@lru_cache(maxsize=2)
+def _utcnow_for_tick(tick):
+    """Wall-clock time captured once per monotonic second."""
+    return datetime.datetime.utcnow()
+
+
+def _coarse_utcnow():
+    """Current UTC time at one-second resolution; mock data needs no more."""
+    return _utcnow_for_tick(int(time.monotonic()))
+
+
+def _uuids(n):
+    """Return n random (version 4) UUID strings from a single urandom call."""
+    random_bytes = os.urandom(16 * n)
+    return [
+        str(uuid.UUID(bytes=random_bytes[i * 16:(i + 1) * 16], version=4))
+        for i in range(n)
+    ]
+
+
+def list_models(now):
+    """Mock models list."""
+    return (
+        {
+            "id": model_id,
+            **row,
+            "created_at": now,
+            "last_trained": now
+        }
+        for model_id, row in zip(_uuids(len(MODEL_ROWS)), MODEL_ROWS)
+    )
+
+
+def list_predictions(now):
+    """Mock predictions list."""
+    job_id, model_id = _uuids(2)
+    return [
+        {
+            "job_id": job_id,
+            "model_id": model_id,
+            **PREDICTION_JOB_ROW,
+            "created_at": now,
+            "completed_at": now
+        }
+    ]
+
+
+def list_training_jobs(now):
+    """Mock training jobs list."""
+    return [
+        {
+            "job_id": str(uuid.uuid4()),
+            **TRAINING_JOB_ROW,
+            "created_at": now,
+            "estimated_completion": now + datetime.timedelta(minutes=15)
+        }
+    ]
+
+
+def list_workflows(now):
+    """Mock workflows list."""
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            **WORKFLOW_ROW,
+            "created_at": now,
+            "last_run": now
+        }
+    ]
+
+
+def create_model(now):
+    """Create new model."""
+    return {
+        "id": str(uuid.uuid4()),
+        "name": "New AI Model",
+        "type": "classification",
+        "status": "training",
+        "created_at": now
+    }
+
+
+def start_batch_prediction(now):
+    """Start batch prediction."""
+    return {
+        "job_id": str(uuid.uuid4()),
+        "status": "queued",
+        "message": "Batch prediction job started",
+        "created_at": now
+    }
+
+
+def start_training_job(now):
+    """Start training job."""
+    return {
+        "job_id": str(uuid.uuid4()),
+        "status": "queued",
+        "message": "Training job started",
+        "created_at": now
+    }
+
+
+# Exact-path dispatch tables; anything not listed is a 404
+GET_ROUTES = {
+    '/api/v1/models/': list_models,
+    '/api/v1/predictions/': list_predictions,
+    '/api/v1/training/': list_training_jobs,
+    '/api/v1/workflows/': list_workflows,
+}
+
+POST_ROUTES = {
+    '/api/v1/models/': create_model,
+    '/api/v1/predictions/batch': start_batch_prediction,
+    '/api/v1/training/': start_training_job,
+}
 
 
 class MockAIHandler(BaseHTTPRequestHandler):
-    def _set_headers(self):
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
+    # Every response carries Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    # Responses go out in one write; don't let Nagle hold them back
+    disable_nagle_algorithm = True
+
+    def _send_body(self, body):
+        """Write status line, headers and body to the socket in a single call."""
+        self.log_request(200)
+        self.wfile.write(
+            JSON_HEAD
+            + b'Date: %s\r\nContent-Length: %d\r\n\r\n' % (self.date_time_string().encode(), len(body))
+            + body
+        )
+
+    def _send_json(self, payload):
+        self._send_body(orjson.dumps(payload, option=ORJSON_OPTIONS))
+
+    def _send_rows(self, rows):
+        """Send a list payload, streamed as NDJSON when the client asks for it."""
+        if 'application/x-ndjson' not in self.headers.get('Accept', ''):
+            self._send_json(list(rows))
+            return
+
+        self.log_request(200)
+        self.wfile.write(
+            NDJSON_HEAD
+            + b'Date: %s\r\nTransfer-Encoding: chunked\r\n\r\n' % self.date_time_string().encode()
+        )
+        for row in rows:
+            line = orjson.dumps(row, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+        self.wfile.write(b'0\r\n\r\n')
 
     def do_OPTIONS(self):
-        self._set_headers()
+        self._send_body(b'')
 
     def do_GET(self):
-        self._set_headers()
-        
-        if self.path == '/api/v1/models/':
-            # Mock models list
-            models = [
-                {
-                    "id": str(uuid.uuid4()),
-                    "name": "Lead Scoring Model",
-                    "type": "classification",
-                    "status": "active",
-                    "accuracy": 0.89,
-                    "version": "v1.2",
-                    "created_at": datetime.datetime.utcnow().isoformat(),
-                    "last_trained": datetime.datetime.utcnow().isoformat()
-                },
-                {
-                    "id": str(uuid.uuid4()),
-                    "name": "Customer Segmentation",
-                    "type": "clustering",
-                    "status": "training",
-                    "accuracy": 0.76,
-                    "version": "v2.1",
-                    "created_at": datetime.datetime.utcnow().isoformat(),
-                    "last_trained": datetime.datetime.utcnow().isoformat()
-                }
-            ]
-            self.wfile.write(json.dumps(models).encode())
-            
-        elif self.path == '/api/v1/predictions/':
-            # Mock predictions list
-            predictions = [
-                {
-                    "job_id": str(uuid.uuid4()),
-                    "status": "completed",
-                    "model_id": str(uuid.uuid4()),
-                    "total_items": 100,
-                    "completed_items": 100,
-                    "failed_items": 0,
-                    "progress": 100.0,
-                    "created_at": datetime.datetime.utcnow().isoformat(),
-                    "completed_at": datetime.datetime.utcnow().isoformat()
-                }
-            ]
-            self.wfile.write(json.dumps(predictions).encode())
-            
-        elif self.path.startswith('/api/v1/training/'):
-            if self.path == '/api/v1/training/':
-                # Mock training jobs list
-                jobs = [
-                    {
-                        "job_id": str(uuid.uuid4()),
-                        "model_name": "Customer Churn Predictor",
-                        "algorithm": "random_forest",
-                        "status": "running",
-                        "progress": 67.5,
-                        "metrics": {
-                            "accuracy": 0.84,
-                            "loss": 0.23,
-                            "validation_accuracy": 0.81,
-                            "validation_loss": 0.28
-                        },
-                        "created_at": datetime.datetime.utcnow().isoformat(),
-                        "estimated_completion": (datetime.datetime.utcnow() + datetime.timedelta(minutes=15)).isoformat()
-                    }
-                ]
-                self.wfile.write(json.dumps(jobs).encode())
-            
-        elif self.path == '/api/v1/workflows/':
-            # Mock workflows list
-            workflows = [
-                {
-                    "id": str(uuid.uuid4()),
-                    "name": "Lead Scoring Pipeline",
-                    "description": "Automated lead scoring and routing workflow",
-                    "status": "active",
-                    "type": "ml_pipeline",
-                    "steps": 5,
-                    "success_rate": 0.94,
-                    "created_at": datetime.datetime.utcnow().isoformat(),
-                    "last_run": datetime.datetime.utcnow().isoformat()
-                }
-            ]
-            self.wfile.write(json.dumps(workflows).encode())
-            
-        else:
+        handler = GET_ROUTES.get(self.path)
+        if handler is None:
             self.send_error(404)
+            return
+        self._send_rows(handler(_coarse_utcnow()))
+
+    def _drain_body(self):
+        """Consume an unused request body so the connection can be reused."""
+        remaining = int(self.headers.get('Content-Length') or 0)
+        if not remaining:
+            return
+        scratch = memoryview(bytearray(min(remaining, 64 * 1024)))
+        while remaining:
+            read = self.rfile.readinto(scratch[:remaining])
+            if not read:
+                break
+            remaining -= read
 
     def do_POST(self):
-        content_length = int(self.headers.get('Content-Length', 0))
-        post_data = self.rfile.read(content_length)
-        
-        self._set_headers()
-        
-        if self.path == '/api/v1/models/':
-            # Create new model
-            model = {
-                "id": str(uuid.uuid4()),
-                "name": "New AI Model",
-                "type": "classification",
-                "status": "training",
-                "created_at": datetime.datetime.utcnow().isoformat()
-            }
-            self.wfile.write(json.dumps(model).encode())
-            
-        elif self.path == '/api/v1/predictions/batch':
-            # Start batch prediction
-            job = {
-                "job_id": str(uuid.uuid4()),
-                "status": "queued",
-                "message": "Batch prediction job started",
-                "created_at": datetime.datetime.utcnow().isoformat()
-            }
-            self.wfile.write(json.dumps(job).encode())
-            
-        elif self.path == '/api/v1/training/':
-            # Start training job
-            job = {
-                "job_id": str(uuid.uuid4()),
-                "status": "queued",
-                "message": "Training job started",
-                "created_at": datetime.datetime.utcnow().isoformat()
-            }
-            self.wfile.write(json.dumps(job).encode())
-            
-        else:
+        handler = POST_ROUTES.get(self.path)
+        if handler is None:
+            # send_error closes the connection, so the body can be left unread
             self.send_error(404)
+            return
+        # None of the mock endpoints look at the request body
+        self._drain_body()
+        self._send_json(handler(_coarse_utcnow()))
 
 
 def run_server():
     server_address = ('', 8005)
-    httpd = HTTPServer(server_address, MockAIHandler)
+    httpd = ThreadingHTTPServer(server_address, MockAIHandler)
     print(f"Mock AI Orchestration Server running on port 8005...")
     print("Available endpoints:")
-    print("  GET /api/v1/models/")
-    print("  POST /api/v1/models/")
-    print("  GET /api/v1/predictions/")
-    print("  POST /api/v1/predictions/batch")
-    print("  GET /api/v1/training/")
-    print("  POST /api/v1/training/")
-    print("  GET /api/v1/workflows/")
+    for path in GET_ROUTES:
+        print(f"  GET {path}")
+    for path in POST_ROUTES:
+        print(f"  POST {path}")
     httpd.serve_forever()
 
 
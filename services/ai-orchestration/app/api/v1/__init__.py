@@ -1,10 +1,11 @@
 """API Router for AI Orchestration Service."""
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from . import insights, workflows, agents, models, predictions, training
 
-# Create API router
-api_router = APIRouter()
+# Create API router; sub-routers inherit the orjson-backed response class
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # Include sub-routers
 api_router.include_router(
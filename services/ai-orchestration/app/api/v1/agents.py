@@ -1,11 +1,47 @@
 """Agents API endpoints for AI agent management and execution."""
 
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# Static catalogue served by /types, encoded once at import time
+_AGENT_TYPES_BYTES = orjson.dumps({
+    "agent_types": [
+        {
+            "name": "sales_assistant",
+            "description": "AI assistant for sales activities",
+            "capabilities": [
+                "lead_qualification",
+                "email_composition", 
+                "meeting_scheduling"
+            ]
+        },
+        {
+            "name": "marketing_analyst",
+            "description": "AI agent for marketing analysis",
+            "capabilities": [
+                "campaign_analysis",
+                "audience_segmentation",
+                "content_optimization"
+            ]
+        },
+        {
+            "name": "customer_support",
+            "description": "AI agent for customer support",
+            "capabilities": [
+                "ticket_classification",
+                "response_generation",
+                "escalation_detection"
+            ]
+        }
+    ]
+})
+
 
 class AgentRequest(BaseModel):
     """Request model for agent execution."""
@@ -15,7 +51,8 @@ class AgentRequest(BaseModel):
     parameters: Optional[Dict[str, Any]] = None
 
 
-class AgentResponse(BaseModel):
+@dataclass(slots=True)
+class AgentResponse:
     """Response model for agent execution."""
     agent_id: str
     agent_type: str
@@ -26,11 +63,11 @@ class AgentResponse(BaseModel):
     timestamp: str
 
 
-@router.post("/execute", response_model=AgentResponse)
+@router.post("/execute", responses={200: {"model": AgentResponse}})
 async def execute_agent(request: AgentRequest):
     """Execute an AI agent."""
     # TODO: Implement actual agent execution using LangChain
-    return AgentResponse(
+    return ORJSONResponse(AgentResponse(
         agent_id="agent_123",
         agent_type=request.agent_type,
         task=request.task,
@@ -42,43 +79,13 @@ async def execute_agent(request: AgentRequest):
         confidence=0.95,
         execution_time=1.23,
         timestamp="2025-09-25T19:00:00Z"
-    )
+    ))
 
 
 @router.get("/types")
 async def get_agent_types():
     """Get available agent types."""
-    return {
-        "agent_types": [
-            {
-                "name": "sales_assistant",
-                "description": "AI assistant for sales activities",
-                "capabilities": [
-                    "lead_qualification",
-                    "email_composition", 
-                    "meeting_scheduling"
-                ]
-            },
-            {
-                "name": "marketing_analyst",
-                "description": "AI agent for marketing analysis",
-                "capabilities": [
-                    "campaign_analysis",
-                    "audience_segmentation",
-                    "content_optimization"
-                ]
-            },
-            {
-                "name": "customer_support",
-                "description": "AI agent for customer support",
-                "capabilities": [
-                    "ticket_classification",
-                    "response_generation",
-                    "escalation_detection"
-                ]
-            }
-        ]
-    }
+    return Response(content=_AGENT_TYPES_BYTES, media_type="application/json")
 
 
 @router.get("/{agent_id}/status")
@@ -1,7 +1,9 @@
 """Insights API endpoints for AI-generated insights and recommendations."""
 
+from dataclasses import dataclass
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -15,7 +17,8 @@ class InsightRequest(BaseModel):
     max_insights: int = 5
 
 
-class Insight(BaseModel):
+@dataclass(slots=True)
+class Insight:
     """Response model for generated insights."""
     id: str
     title: str
@@ -26,18 +29,19 @@ class Insight(BaseModel):
     created_at: str
 
 
-class InsightResponse(BaseModel):
+@dataclass(slots=True)
+class InsightResponse:
     """Response wrapper for insights."""
     success: bool
     insights: List[Insight]
     total_count: int
 
 
-@router.post("/generate", response_model=InsightResponse)
+@router.post("/generate", responses={200: {"model": InsightResponse}})
 async def generate_insights(request: InsightRequest):
     """Generate AI insights based on provided data."""
     # TODO: Implement actual insight generation using LangChain
-    return InsightResponse(
+    return ORJSONResponse(InsightResponse(
         success=True,
         insights=[
             Insight(
@@ -55,21 +59,21 @@ async def generate_insights(request: InsightRequest):
             )
         ],
         total_count=1
-    )
+    ))
 
 
-@router.get("/contact/{contact_id}", response_model=InsightResponse)
+@router.get("/contact/{contact_id}", responses={200: {"model": InsightResponse}})
 async def get_contact_insights(
     contact_id: str,
     limit: int = Query(default=10, le=50)
 ):
     """Get insights for a specific contact."""
     # TODO: Retrieve insights from database
-    return InsightResponse(
-        success=True,
-        insights=[],
-        total_count=0
-    )
+    return ORJSONResponse({
+        "success": True,
+        "insights": [],
+        "total_count": 0
+    })
 
 
 @router.get("/recommendations/{contact_id}")
@@ -1,13 +1,25 @@
 """AI Models API endpoints for model management and deployment."""
 
-from typing import List, Optional, Dict, Any, Union
+from typing import Annotated, Any, Callable, Dict, List, Optional, Union
 from uuid import uuid4
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from functools import lru_cache, partial
+import hashlib
+import itertools
+import time
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
 router = APIRouter()
 
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 class ModelConfig(BaseModel):
     """Model configuration schema."""
@@ -57,69 +69,269 @@ class PredictionRequest(BaseModel):
     options: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Prediction options")
 
 
-class PredictionResponse(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class PredictionResponse:
     """Prediction response schema."""
-    prediction: Union[str, int, float, Dict[str, Any]] = Field(..., description="Model prediction")
-    confidence: Optional[float] = Field(None, description="Prediction confidence score")
-    explanation: Optional[Dict[str, Any]] = Field(None, description="Prediction explanation")
-    model_id: str = Field(..., description="Model ID used for prediction")
-    timestamp: datetime = Field(..., description="Prediction timestamp")
+    prediction: Annotated[Union[str, int, float, Dict[str, Any]], Field(description="Model prediction")]
+    confidence: Annotated[Optional[float], Field(description="Prediction confidence score")] = None
+    explanation: Annotated[Optional[Dict[str, Any]], Field(description="Prediction explanation")] = None
+    model_id: Annotated[str, Field(description="Model ID used for prediction")]
+    timestamp: Annotated[datetime, Field(description="Prediction timestamp")]
+
+
+# deploy_model parses its own body, so describe it for the OpenAPI docs
+_MODEL_CREATE_SCHEMA = ModelCreate.model_json_schema(ref_template="#/components/schemas/{model}")
+_MODEL_CREATE_SCHEMA.pop("$defs", None)
+
+
+# Validated ModelCreate fields by body digest, so the cache holds neither
+# the request bodies nor a second copy of them as keys
+MODEL_FIELDS_CACHE_SIZE = 256
+_model_fields_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+
+def _model_fields_for_body(body: bytes) -> Dict[str, Any]:
+    """Validate a ModelCreate body once per distinct payload.
+    
+    Repeated deploys of the same definition skip pydantic validation. The
+    result is shared between calls and must not be mutated; callers only
+    serialize it into the stored model.
+    """
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    fields = _model_fields_cache.get(digest)
+    if fields is not None:
+        _model_fields_cache.move_to_end(digest)
+        return fields
+    
+    model = ModelCreate.model_validate_json(body)
+    fields = {
+        "name": model.name,
+        "description": model.description,
+        "type": model.type,
+        "framework": model.framework,
+        "version": model.version,
+        "model_configuration": model.model_configuration.model_dump(),
+        "input_schema": model.input_schema.model_dump(),
+    }
+    _model_fields_cache[digest] = fields
+    if len(_model_fields_cache) > MODEL_FIELDS_CACHE_SIZE:
+        _model_fields_cache.popitem(last=False)
+    return fields
+
+
+@lru_cache(maxsize=2)
+def _utcnow_for_tick(tick: int) -> datetime:
+    """Wall-clock time captured once per monotonic second."""
+    return datetime.utcnow()
+
+
+def _coarse_utcnow() -> datetime:
+    """Current UTC time at one-second resolution, cheap to call per request."""
+    return _utcnow_for_tick(int(time.monotonic()))
+
+
+# Mock database for models (in production, this would be a real database).
+# Models are kept as serialized JSON so read endpoints never re-encode them.
+_models_db: Dict[str, bytes] = {}
+
+# Fields the endpoints filter and branch on, kept out of the JSON rows
+_models_meta: Dict[str, Dict[str, str]] = {}
+
+# Prediction function for each stored model, picked when the model is written
+# so the predict endpoint doesn't re-derive it from the name and type
+_predictors: Dict[str, Callable[..., "PredictionResponse"]] = {}
+
+# Secondary indexes: type / status -> model ids. Dicts are used as ordered
+# sets so filtered listings keep a stable order for pagination.
+_by_type: Dict[str, Dict[str, None]] = defaultdict(dict)
+_by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
+
+
+# Lead scoring weights for engagement, profile and interaction frequency
+_LEAD_SCORING_WEIGHTS = (0.4, 0.4, 0.2)
+
 
+def _predict_lead_scoring(model_id: str, inputs: Dict[str, Any], now: datetime) -> "PredictionResponse":
+    """Score a lead from engagement, profile and interaction frequency."""
+    engagement_score = inputs.get("engagement_score", 0.5)
+    profile_score = inputs.get("profile_score", 0.5)
+    interaction_frequency = inputs.get("interaction_frequency", 5)
+    
+    # Simple scoring formula; keep the operation order, since regrouping
+    # changes the float results near the category thresholds
+    score = (engagement_score * 0.4 + profile_score * 0.4 + (interaction_frequency / 20) * 0.2)
+    prediction = "high" if score > 0.7 else "medium" if score > 0.4 else "low"
+    rounded_score = round(score, 3)
+    
+    return PredictionResponse(
+        prediction={
+            "category": prediction,
+            "score": rounded_score,
+            "probability": rounded_score
+        },
+        confidence=rounded_score,
+        explanation={
+            "engagement_weight": _LEAD_SCORING_WEIGHTS[0],
+            "profile_weight": _LEAD_SCORING_WEIGHTS[1],
+            "interaction_weight": _LEAD_SCORING_WEIGHTS[2],
+            "factors": {
+                "engagement_score": engagement_score,
+                "profile_score": profile_score,
+                "interaction_frequency": interaction_frequency
+            }
+        },
+        model_id=model_id,
+        timestamp=now
+    )
+
+
+def _predict_fixed(
+    prediction: Union[str, float],
+    confidence: float,
+    explanation: Dict[str, Any],
+    model_id: str,
+    inputs: Dict[str, Any],
+    now: datetime
+) -> "PredictionResponse":
+    """Return a canned prediction for models without real scoring logic."""
+    return PredictionResponse(
+        prediction=prediction,
+        confidence=confidence,
+        explanation=explanation,
+        model_id=model_id,
+        timestamp=now
+    )
+
+
+def _pick_predictor(model_data: Dict[str, Any]) -> Callable[..., "PredictionResponse"]:
+    """Choose the prediction function for a model based on its type and name."""
+    algorithm = model_data["model_configuration"]["algorithm"]
+    if model_data["type"] == "classification":
+        if "lead_scoring" in model_data["name"].lower():
+            return _predict_lead_scoring
+        # Generic classification
+        return partial(
+            _predict_fixed, "positive", 0.85,
+            {"model_type": "classification", "algorithm": algorithm}
+        )
+    # Generic prediction for other types
+    return partial(
+        _predict_fixed, 42.5, 0.80,
+        {"model_type": model_data["type"], "algorithm": algorithm}
+    )
 
-# Mock database for models (in production, this would be a real database)
-_models_db: Dict[str, Dict[str, Any]] = {}
 
+def _store_model(model_data: Dict[str, Any]) -> None:
+    """Insert or replace a model, keeping the secondary indexes in sync."""
+    model_id = model_data["id"]
+    existing = _models_meta.get(model_id)
+    if existing is not None:
+        if existing["type"] != model_data["type"]:
+            _by_type[existing["type"]].pop(model_id, None)
+        if existing["status"] != model_data["status"]:
+            _by_status[existing["status"]].pop(model_id, None)
+    
+    _models_db[model_id] = orjson.dumps(model_data)
+    _models_meta[model_id] = {"type": model_data["type"], "status": model_data["status"]}
+    _predictors[model_id] = _pick_predictor(model_data)
+    _by_type[model_data["type"]][model_id] = None
+    _by_status[model_data["status"]][model_id] = None
+
+
+def _remove_model(model_id: str) -> None:
+    """Delete a model and drop it from the secondary indexes."""
+    del _models_db[model_id]
+    model_data = _models_meta.pop(model_id)
+    del _predictors[model_id]
+    _by_type[model_data["type"]].pop(model_id, None)
+    _by_status[model_data["status"]].pop(model_id, None)
 
-@router.get("/", response_model=List[ModelResponse])
+
+@router.get("/", responses={200: {"model": List[ModelResponse]}})
 async def list_models(
     skip: int = 0,
     limit: int = 20,
     model_type: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    accept: Optional[str] = Header(default=None)
 ):
-    """List available AI models."""
-    models = list(_models_db.values())
+    """List available AI models.
     
-    # Apply filters
+    Clients sending `Accept: application/x-ndjson` receive one JSON object
+    per line instead of a single JSON array.
+    """
+    # Apply filters by walking the smallest matching index and probing the rest
+    indexes = []
     if model_type:
-        models = [m for m in models if m.get("type") == model_type]
+        indexes.append(_by_type.get(model_type, {}))
     if status:
-        models = [m for m in models if m.get("status") == status]
+        indexes.append(_by_status.get(status, {}))
     
-    # Apply pagination
-    models = models[skip:skip + limit]
+    if indexes:
+        indexes.sort(key=len)
+        smallest, others = indexes[0], indexes[1:]
+        model_ids = (
+            model_id for model_id in smallest
+            if all(model_id in index for index in others)
+        )
+    else:
+        model_ids = iter(_models_db)
     
-    return [ModelResponse(**model) for model in models]
+    # Apply pagination, then splice the pre-serialized rows together
+    rows = [_models_db[model_id] for model_id in itertools.islice(model_ids, skip, skip + limit)]
+    
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingResponse(
+            (row + b"\n" for row in rows),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    return Response(content=b"[" + b",".join(rows) + b"]", media_type=JSON_MEDIA_TYPE)
 
 
-@router.post("/", response_model=ModelResponse, status_code=status.HTTP_201_CREATED)
-async def deploy_model(model: ModelCreate):
+@router.post(
+    "/",
+    response_model=ModelResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {JSON_MEDIA_TYPE: {"schema": _MODEL_CREATE_SCHEMA}}
+        }
+    }
+)
+async def deploy_model(request: Request):
     """Deploy a new AI model."""
+    body = await request.body()
+    try:
+        fields = _model_fields_for_body(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    
     model_id = str(uuid4())
     now = datetime.utcnow()
     
+    # The cached fields are serialized by _store_model and never mutated, so
+    # they are spread in without copying
     model_data = {
         "id": model_id,
-        "name": model.name,
-        "description": model.description,
-        "type": model.type,
-        "framework": model.framework,
-        "version": model.version,
+        **fields,
         "status": "deployed",
-        "model_configuration": model.model_configuration.dict(),
-        "input_schema": model.input_schema.dict(),
         "created_at": now,
         "updated_at": now,
         "accuracy": 0.85,  # Mock accuracy
         "deployment_url": f"/api/v1/models/{model_id}/predict"
     }
     
-    _models_db[model_id] = model_data
+    _store_model(model_data)
     
-    return ModelResponse(**model_data)
+    return Response(
+        content=_models_db[model_id],
+        status_code=status.HTTP_201_CREATED,
+        media_type=JSON_MEDIA_TYPE
+    )
 
 
-@router.get("/{model_id}", response_model=ModelResponse)
+@router.get("/{model_id}", responses={200: {"model": ModelResponse}})
 async def get_model(model_id: str):
     """Get details of a specific model."""
     if model_id not in _models_db:
@@ -128,7 +340,7 @@ async def get_model(model_id: str):
             detail=f"Model with id {model_id} not found"
         )
     
-    return ModelResponse(**_models_db[model_id])
+    return Response(content=_models_db[model_id], media_type=JSON_MEDIA_TYPE)
 
 
 @router.put("/{model_id}", response_model=ModelResponse)
@@ -140,7 +352,9 @@ async def update_model(model_id: str, model: ModelCreate):
             detail=f"Model with id {model_id} not found"
         )
     
-    existing_model = _models_db[model_id]
+    # Writes are rare, so decoding the stored row here is cheaper than keeping
+    # a dict copy of every model around for reads
+    existing_model = orjson.loads(_models_db[model_id])
     updated_model = {
         **existing_model,
         "name": model.name,
@@ -148,14 +362,14 @@ async def update_model(model_id: str, model: ModelCreate):
         "type": model.type,
         "framework": model.framework,
         "version": model.version,
-        "model_configuration": model.model_configuration.dict(),
-        "input_schema": model.input_schema.dict(),
+        "model_configuration": model.model_configuration.model_dump(),
+        "input_schema": model.input_schema.model_dump(),
         "updated_at": datetime.utcnow()
     }
     
-    _models_db[model_id] = updated_model
+    _store_model(updated_model)
     
-    return ModelResponse(**updated_model)
+    return Response(content=_models_db[model_id], media_type=JSON_MEDIA_TYPE)
 
 
 @router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -167,10 +381,10 @@ async def delete_model(model_id: str):
             detail=f"Model with id {model_id} not found"
         )
     
-    del _models_db[model_id]
+    _remove_model(model_id)
 
 
-@router.post("/{model_id}/predict", response_model=PredictionResponse)
+@router.post("/{model_id}/predict", responses={200: {"model": PredictionResponse}})
 async def predict_with_model(model_id: str, request: PredictionRequest):
     """Make a prediction using a specific model."""
     if model_id not in _models_db:
@@ -179,66 +393,16 @@ async def predict_with_model(model_id: str, request: PredictionRequest):
             detail=f"Model with id {model_id} not found"
         )
     
-    model = _models_db[model_id]
+    model_status = _models_meta[model_id]["status"]
+    now = _coarse_utcnow()
     
-    if model["status"] != "deployed":
+    if model_status != "deployed":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Model {model_id} is not deployed (status: {model['status']})"
-        )
-    
-    # Mock prediction logic based on model type
-    if model["type"] == "classification":
-        if "lead_scoring" in model["name"].lower():
-            # Lead scoring prediction
-            engagement_score = request.inputs.get("engagement_score", 0.5)
-            profile_score = request.inputs.get("profile_score", 0.5)
-            interaction_frequency = request.inputs.get("interaction_frequency", 5)
-            
-            # Simple scoring formula
-            score = (engagement_score * 0.4 + profile_score * 0.4 + (interaction_frequency / 20) * 0.2)
-            prediction = "high" if score > 0.7 else "medium" if score > 0.4 else "low"
-            
-            response = PredictionResponse(
-                prediction={
-                    "category": prediction,
-                    "score": round(score, 3),
-                    "probability": round(score, 3)
-                },
-                confidence=round(score, 3),
-                explanation={
-                    "engagement_weight": 0.4,
-                    "profile_weight": 0.4,
-                    "interaction_weight": 0.2,
-                    "factors": {
-                        "engagement_score": engagement_score,
-                        "profile_score": profile_score,
-                        "interaction_frequency": interaction_frequency
-                    }
-                },
-                model_id=model_id,
-                timestamp=datetime.utcnow()
-            )
-        else:
-            # Generic classification
-            response = PredictionResponse(
-                prediction="positive",
-                confidence=0.85,
-                explanation={"model_type": "classification", "algorithm": model["model_configuration"]["algorithm"]},
-                model_id=model_id,
-                timestamp=datetime.utcnow()
-            )
-    else:
-        # Generic prediction for other types
-        response = PredictionResponse(
-            prediction=42.5,
-            confidence=0.80,
-            explanation={"model_type": model["type"], "algorithm": model["model_configuration"]["algorithm"]},
-            model_id=model_id,
-            timestamp=datetime.utcnow()
+            detail=f"Model {model_id} is not deployed (status: {model_status})"
         )
     
-    return response
+    return ORJSONResponse(_predictors[model_id](model_id, request.inputs, now))
 
 
 @router.get("/{model_id}/metrics")
@@ -2,10 +2,16 @@
 
 from typing import List, Optional, Dict, Any, Union
 from uuid import uuid4
+from collections import defaultdict
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from bisect import bisect_left, insort
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel, Field
 import asyncio
+import itertools
+
+from app.core.job_index import JobKey, decode_cursor, encode_cursor, index_remove, job_key
+from app.core.jobs import job_queue
 
 router = APIRouter()
 
@@ -86,50 +92,96 @@ class HyperparameterTuningRequest(BaseModel):
 # Mock database for training jobs
 _training_jobs_db: Dict[str, Dict[str, Any]] = {}
 
+# Creation-ordered key lists over all jobs and per status / algorithm / tag,
+# so listings can seek straight to a cursor instead of sorting and skipping
+_by_created: List[JobKey] = []
+_by_status: Dict[str, List[JobKey]] = defaultdict(list)
+_by_algorithm: Dict[str, List[JobKey]] = defaultdict(list)
+_by_tag: Dict[str, List[JobKey]] = defaultdict(list)
+
+
+def _insert_job(job: Dict[str, Any]) -> None:
+    """Store a new job and add it to the secondary indexes."""
+    key = job_key(job)
+    _training_jobs_db[job["job_id"]] = job
+    insort(_by_created, key)
+    insort(_by_status[job["status"]], key)
+    insort(_by_algorithm[job["algorithm"]], key)
+    for tag in set(job.get("tags") or ()):
+        insort(_by_tag[tag], key)
+
+
+def _set_job_status(job: Dict[str, Any], new_status: str) -> None:
+    """Change a job's status, moving it between status index buckets."""
+    key = job_key(job)
+    index_remove(_by_status[job["status"]], key)
+    job["status"] = new_status
+    insort(_by_status[new_status], key)
+
+
+def _delete_job(job_id: str) -> None:
+    """Delete a job and drop it from the secondary indexes."""
+    job = _training_jobs_db.pop(job_id)
+    key = job_key(job)
+    index_remove(_by_created, key)
+    index_remove(_by_status[job["status"]], key)
+    index_remove(_by_algorithm[job["algorithm"]], key)
+    for tag in set(job.get("tags") or ()):
+        index_remove(_by_tag[tag], key)
+
+
+# Simulated wall-clock cost of one training epoch
+EPOCH_SECONDS = 0.01
+
+
+def _simulated_metrics(epoch: int, total_epochs: int) -> Dict[str, Any]:
+    """Metrics the simulated model reaches after `epoch` of `total_epochs`."""
+    base_accuracy = 0.6
+    improvement = (epoch / total_epochs) * 0.25  # Up to 25% improvement
+    noise = 0.02 * (1 - epoch / total_epochs)  # Decreasing noise
+    
+    current_accuracy = base_accuracy + improvement + (noise * (0.5 - abs(0.5 - (epoch % 10) / 10)))
+    
+    return TrainingMetrics(
+        accuracy=round(current_accuracy, 4),
+        precision=round(current_accuracy * 0.98, 4),
+        recall=round(current_accuracy * 1.02, 4),
+        f1_score=round(current_accuracy, 4),
+        loss=round((1 - current_accuracy) * 0.8, 4),
+        val_loss=round((1 - current_accuracy) * 0.9, 4),
+        training_time_seconds=epoch * EPOCH_SECONDS,
+        epochs_completed=epoch
+    ).model_dump()
+
 
 async def simulate_training_job(job_id: str, algorithm: str, hyperparameters: Dict[str, Any]):
     """Simulate model training process."""
     job = _training_jobs_db[job_id]
-    job["status"] = "running"
+    if job["status"] == "cancelled":
+        return
+    _set_job_status(job, "running")
     job["started_at"] = datetime.utcnow()
     
     # Simulate training progress
     total_epochs = hyperparameters.get("n_estimators", hyperparameters.get("epochs", 100))
     
-    for epoch in range(1, total_epochs + 1):
-        # Simulate training time
-        await asyncio.sleep(0.01)  # Fast simulation
-        
-        # Update progress
-        progress = (epoch / total_epochs) * 100
-        job["progress"] = progress
+    # Report progress at doubling epoch checkpoints, sleeping through the
+    # epochs in between, so a job wakes the loop O(log epochs) times
+    epoch = 0
+    while epoch < total_epochs:
+        next_epoch = min(max(epoch * 2, 1), total_epochs)
+        await asyncio.sleep((next_epoch - epoch) * EPOCH_SECONDS)
+        epoch = next_epoch
         
-        # Simulate improving metrics
-        base_accuracy = 0.6
-        improvement = (epoch / total_epochs) * 0.25  # Up to 25% improvement
-        noise = 0.02 * (1 - epoch / total_epochs)  # Decreasing noise
+        # Cancelled (and possibly deleted) while we slept
+        if job["status"] == "cancelled":
+            return
         
-        current_accuracy = base_accuracy + improvement + (noise * (0.5 - abs(0.5 - (epoch % 10) / 10)))
-        
-        metrics = TrainingMetrics(
-            accuracy=round(current_accuracy, 4),
-            precision=round(current_accuracy * 0.98, 4),
-            recall=round(current_accuracy * 1.02, 4),
-            f1_score=round(current_accuracy, 4),
-            loss=round((1 - current_accuracy) * 0.8, 4),
-            val_loss=round((1 - current_accuracy) * 0.9, 4),
-            training_time_seconds=epoch * 0.01,
-            epochs_completed=epoch
-        )
-        
-        job["metrics"] = metrics.dict()
-        
-        # Early stopping simulation
-        if epoch > 10 and current_accuracy > 0.95:
-            break
+        job["progress"] = (epoch / total_epochs) * 100
+        job["metrics"] = _simulated_metrics(epoch, total_epochs)
     
     # Training completed
-    job["status"] = "completed"
+    _set_job_status(job, "completed")
     job["completed_at"] = datetime.utcnow()
     job["progress"] = 100.0
     
@@ -145,10 +197,7 @@ async def simulate_training_job(job_id: str, algorithm: str, hyperparameters: Di
 
 
 @router.post("/jobs", response_model=TrainingJobResponse, status_code=status.HTTP_201_CREATED)
-async def create_training_job(
-    request: TrainingJobRequest,
-    background_tasks: BackgroundTasks
-):
+async def create_training_job(request: TrainingJobRequest):
     """Start a new model training job."""
     job_id = str(uuid4())
     now = datetime.utcnow()
@@ -187,15 +236,16 @@ async def create_training_job(
         "tags": request.tags
     }
     
-    _training_jobs_db[job_id] = job_data
-    
-    # Start background training
-    background_tasks.add_task(
-        simulate_training_job,
-        job_id,
-        request.algorithm,
-        request.hyperparameters
-    )
+    # Queue background training; nothing awaits before the job is stored, so
+    # a worker cannot pick it up first
+    try:
+        job_queue.enqueue(simulate_training_job, job_id, request.algorithm, request.hyperparameters)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Training queue is full, retry later"
+        )
+    _insert_job(job_data)
     
     return TrainingJobResponse(**job_data)
 
@@ -221,29 +271,50 @@ async def get_training_job(job_id: str):
 
 @router.get("/jobs", response_model=List[TrainingJobResponse])
 async def list_training_jobs(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     status_filter: Optional[str] = None,
     algorithm: Optional[str] = None,
-    tags: Optional[str] = None
+    tags: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """List training jobs with optional filtering."""
-    jobs = list(_training_jobs_db.values())
+    """List training jobs with optional filtering.
     
-    # Apply filters
+    When a page is full, its `X-Next-Cursor` response header can be passed
+    back as `cursor` to fetch the next page without re-walking earlier ones;
+    `skip` is kept for existing clients.
+    """
+    tag_set = {tag.strip() for tag in tags.split(",")} if tags else None
+    
+    # Walk the smallest matching index and check the other filters per job.
+    # Tags match if the job has any of them, so a single tag can be walked.
+    candidates = [_by_created]
     if status_filter:
-        jobs = [job for job in jobs if job["status"] == status_filter]
+        candidates.append(_by_status.get(status_filter, []))
     if algorithm:
-        jobs = [job for job in jobs if job["algorithm"] == algorithm]
-    if tags:
-        tag_list = [tag.strip() for tag in tags.split(",")]
-        jobs = [job for job in jobs if any(tag in job.get("tags", []) for tag in tag_list)]
+        candidates.append(_by_algorithm.get(algorithm, []))
+    if tag_set and len(tag_set) == 1:
+        candidates.append(_by_tag.get(next(iter(tag_set)), []))
+    index = min(candidates, key=len)
+    
+    def matches(key: JobKey) -> bool:
+        job = _training_jobs_db[key[1]]
+        return (
+            (not status_filter or job["status"] == status_filter)
+            and (not algorithm or job["algorithm"] == algorithm)
+            and (not tag_set or not tag_set.isdisjoint(job.get("tags") or ()))
+        )
     
-    # Sort by creation time (newest first)
-    jobs = sorted(jobs, key=lambda x: x["created_at"], reverse=True)
+    # Seek to the cursor, then walk backwards for newest first
+    end = bisect_left(index, decode_cursor(cursor)) if cursor else len(index)
+    keys = filter(matches, (index[position] for position in range(end - 1, -1, -1)))
     
     # Apply pagination
-    jobs = jobs[skip:skip + limit]
+    page = list(itertools.islice(keys, skip, skip + limit))
+    if page and len(page) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1])
+    jobs = [_training_jobs_db[job_id] for _, job_id in page]
     
     # Convert to response models
     response_jobs = []
@@ -273,7 +344,7 @@ async def cancel_training_job(job_id: str):
             detail=f"Cannot cancel job with status: {job['status']}"
         )
     
-    job["status"] = "cancelled"
+    _set_job_status(job, "cancelled")
     job["completed_at"] = datetime.utcnow()
     job["error_message"] = "Training job cancelled by user"
     
@@ -297,14 +368,11 @@ async def delete_training_job(job_id: str):
             detail="Cannot delete running or queued jobs. Cancel the job first."
         )
     
-    del _training_jobs_db[job_id]
+    _delete_job(job_id)
 
 
 @router.post("/hyperparameter-tuning", response_model=TrainingJobResponse)
-async def start_hyperparameter_tuning(
-    request: HyperparameterTuningRequest,
-    background_tasks: BackgroundTasks
-):
+async def start_hyperparameter_tuning(request: HyperparameterTuningRequest):
     """Start hyperparameter tuning job."""
     job_id = str(uuid4())
     now = datetime.utcnow()
@@ -336,15 +404,20 @@ async def start_hyperparameter_tuning(
         "tags": ["hyperparameter_tuning"]
     }
     
-    _training_jobs_db[job_id] = job_data
-    
-    # Start background tuning (simplified as regular training for demo)
-    background_tasks.add_task(
-        simulate_training_job,
-        job_id,
-        request.algorithm,
-        {"n_estimators": request.max_trials}
-    )
+    # Queue background tuning (simplified as regular training for demo)
+    try:
+        job_queue.enqueue(
+            simulate_training_job,
+            job_id,
+            request.algorithm,
+            {"n_estimators": request.max_trials}
+        )
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Training queue is full, retry later"
+        )
+    _insert_job(job_data)
     
     return TrainingJobResponse(**job_data)
 
@@ -393,19 +466,9 @@ async def get_training_stats():
     """Get overall training statistics."""
     total_jobs = len(_training_jobs_db)
     
-    status_counts = {}
-    algorithm_counts = {}
-    successful_jobs = 0
-    
-    for job in _training_jobs_db.values():
-        status = job["status"]
-        algorithm = job["algorithm"]
-        
-        status_counts[status] = status_counts.get(status, 0) + 1
-        algorithm_counts[algorithm] = algorithm_counts.get(algorithm, 0) + 1
-        
-        if status == "completed":
-            successful_jobs += 1
+    status_counts = {status: len(keys) for status, keys in _by_status.items() if keys}
+    algorithm_counts = {algorithm: len(keys) for algorithm, keys in _by_algorithm.items() if keys}
+    successful_jobs = status_counts.get("completed", 0)
     
     success_rate = (successful_jobs / total_jobs * 100) if total_jobs > 0 else 0
     
@@ -1,11 +1,37 @@
 """Workflow API endpoints for AI workflow execution and management."""
 
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+import msgspec
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 router = APIRouter()
 
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+# The body format depends on Accept, so caches must key responses on it
+_VARY_ACCEPT = {"Vary": "Accept"}
+
+# Shared by every response; reusing one encoder keeps its output buffer
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+class MsgPackResponse(Response):
+    """Response with a MessagePack-encoded body."""
+    media_type = MSGPACK_MEDIA_TYPE
+    
+    def render(self, content: Any) -> bytes:
+        return _msgpack_encoder.encode(content)
+
+
+def _negotiated_response(content: Any, accept: Optional[str]) -> Response:
+    """MessagePack for clients that ask for it (internal services), JSON otherwise."""
+    if accept and MSGPACK_MEDIA_TYPE in accept:
+        return MsgPackResponse(content, headers=_VARY_ACCEPT)
+    return ORJSONResponse(content, headers=_VARY_ACCEPT)
+
 
 class WorkflowRequest(BaseModel):
     """Request model for executing workflows."""
@@ -25,11 +51,14 @@ class WorkflowExecution(BaseModel):
     completed_at: Optional[str] = None
 
 
-@router.post("/execute", response_model=WorkflowExecution)
-async def execute_workflow(request: WorkflowRequest):
-    """Execute an AI workflow."""
+@router.post("/execute", responses={200: {"model": WorkflowExecution}})
+async def execute_workflow(request: WorkflowRequest, accept: Optional[str] = Header(default=None)):
+    """Execute an AI workflow.
+    
+    Clients sending `Accept: application/x-msgpack` receive MessagePack.
+    """
     # TODO: Implement actual workflow execution using LangChain
-    return WorkflowExecution(
+    execution = WorkflowExecution(
         execution_id="exec_123",
         workflow_type=request.workflow_type,
         status="completed",
@@ -40,47 +69,64 @@ async def execute_workflow(request: WorkflowRequest):
         started_at="2025-09-25T19:00:00Z",
         completed_at="2025-09-25T19:00:30Z"
     )
+    return _negotiated_response(execution.model_dump(), accept)
 
 
-@router.get("/types")
-async def get_workflow_types():
-    """Get available workflow types."""
-    return {
-        "workflow_types": [
-            {
-                "name": "lead_scoring",
-                "description": "Score leads based on engagement and profile data",
-                "input_schema": {
-                    "contact_id": "string",
-                    "interaction_history": "array"
-                }
-            },
-            {
-                "name": "content_generation", 
-                "description": "Generate personalized content for contacts",
-                "input_schema": {
-                    "contact_id": "string",
-                    "content_type": "string",
-                    "tone": "string"
-                }
-            },
-            {
-                "name": "next_best_action",
-                "description": "Recommend the next best action for a contact",
-                "input_schema": {
-                    "contact_id": "string",
-                    "current_stage": "string"
-                }
+# Fixed catalogue, encoded once for both media types
+WORKFLOW_TYPES: Dict[str, Any] = {
+    "workflow_types": [
+        {
+            "name": "lead_scoring",
+            "description": "Score leads based on engagement and profile data",
+            "input_schema": {
+                "contact_id": "string",
+                "interaction_history": "array"
             }
-        ]
-    }
+        },
+        {
+            "name": "content_generation", 
+            "description": "Generate personalized content for contacts",
+            "input_schema": {
+                "contact_id": "string",
+                "content_type": "string",
+                "tone": "string"
+            }
+        },
+        {
+            "name": "next_best_action",
+            "description": "Recommend the next best action for a contact",
+            "input_schema": {
+                "contact_id": "string",
+                "current_stage": "string"
+            }
+        }
+    ]
+}
+_WORKFLOW_TYPES_JSON = orjson.dumps(WORKFLOW_TYPES)
+_WORKFLOW_TYPES_MSGPACK = _msgpack_encoder.encode(WORKFLOW_TYPES)
+
+
+@router.get("/types")
+async def get_workflow_types(accept: Optional[str] = Header(default=None)):
+    """Get available workflow types.
+    
+    Clients sending `Accept: application/x-msgpack` receive MessagePack.
+    """
+    if accept and MSGPACK_MEDIA_TYPE in accept:
+        return Response(
+            content=_WORKFLOW_TYPES_MSGPACK, media_type=MSGPACK_MEDIA_TYPE, headers=_VARY_ACCEPT
+        )
+    return Response(content=_WORKFLOW_TYPES_JSON, media_type="application/json", headers=_VARY_ACCEPT)
 
 
-@router.get("/execution/{execution_id}", response_model=WorkflowExecution)
-async def get_execution_status(execution_id: str):
-    """Get the status of a workflow execution."""
+@router.get("/execution/{execution_id}", responses={200: {"model": WorkflowExecution}})
+async def get_execution_status(execution_id: str, accept: Optional[str] = Header(default=None)):
+    """Get the status of a workflow execution.
+    
+    Clients sending `Accept: application/x-msgpack` receive MessagePack.
+    """
     # TODO: Retrieve from database
-    return WorkflowExecution(
+    execution = WorkflowExecution(
         execution_id=execution_id,
         workflow_type="lead_scoring",
         status="completed",
@@ -88,3 +134,4 @@ async def get_execution_status(execution_id: str):
         started_at="2025-09-25T19:00:00Z",
         completed_at="2025-09-25T19:00:30Z"
     )
+    return _negotiated_response(execution.model_dump(), accept)
@@ -5,10 +5,10 @@ tenant isolation, TTL management, and semantic similarity caching for LLM respon
 """
 
 from typing import Optional, Any, Dict
-import json
-import asyncio
+from functools import lru_cache
 from redis.asyncio import Redis
-from redis.asyncio.connection import ConnectionPool
+from redis.asyncio.connection import ConnectionPool, UnixDomainSocketConnection
+import msgspec
 import numpy as np
 # from sentence_transformers import SentenceTransformer
 import structlog
@@ -22,21 +22,55 @@ EMBEDDING_MODEL = None
 # if settings.CACHE_EMBEDDINGS:
 #     EMBEDDING_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
 
-# Create Redis connection pool
-redis_pool = ConnectionPool.from_url(
-    str(settings.REDIS_URL),
-    max_connections=20,
-    decode_responses=True
-)
+
+@lru_cache(maxsize=4096)
+def encode_text(text: str) -> np.ndarray:
+    """Embed text with EMBEDDING_MODEL, remembering recent texts.
+    
+    Identical prompts recur often, and inference is the most expensive step
+    of a semantic lookup. The returned array is shared, so it is read-only.
+    """
+    embeddings = np.asarray(EMBEDDING_MODEL.encode(text), dtype=np.float32)
+    embeddings.setflags(write=False)
+    return embeddings
+
+# Create Redis connection pool; replies are left as bytes, since cached
+# entries are msgpack and job results are stored pre-serialized. A co-located
+# Redis is reached over its UNIX socket, skipping the TCP stack.
+if settings.REDIS_UNIX_SOCKET:
+    redis_pool = ConnectionPool(
+        connection_class=UnixDomainSocketConnection,
+        path=settings.REDIS_UNIX_SOCKET,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        max_connections=20
+    )
+else:
+    redis_pool = ConnectionPool.from_url(
+        str(settings.REDIS_URL),
+        max_connections=20
+    )
 
 # Create Redis client instance
 redis_client = Redis(
     connection_pool=redis_pool,
-    encoding='utf-8',
-    decode_responses=True
+    encoding='utf-8'
 )
 
 
+# Keys per UNLINK when clearing a tenant
+CLEAR_BATCH_SIZE = 10_000
+
+
+class CacheEntry(msgspec.Struct):
+    """Cached value; its embeddings live under a sibling key (see get_embeddings_key)."""
+    value: Any
+
+
+_cache_encoder = msgspec.msgpack.Encoder()
+_cache_decoder = msgspec.msgpack.Decoder(CacheEntry)
+
+
 def get_tenant_key(key: str, tenant_id: str) -> str:
     """Generate tenant-scoped Redis key.
     
@@ -50,6 +84,31 @@ def get_tenant_key(key: str, tenant_id: str) -> str:
     return f"{tenant_id}:{key}"
 
 
+def get_embeddings_key(tenant_key: str) -> str:
+    """Sibling key holding a cached value's embeddings as raw float32 bytes.
+    
+    Kept apart from the value so semantic lookups can fetch every candidate
+    vector without decoding the cached values. Vectors are stored L2
+    normalised, so lookups never recompute their norms.
+    """
+    return f"{tenant_key}:emb"
+
+
+def _unit_vector(embeddings: np.ndarray) -> np.ndarray:
+    """Embeddings as an L2-normalised float32 vector (zero vectors stay zero)."""
+    vector = np.asarray(embeddings, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def get_semantic_index_key(tenant_id: str) -> str:
+    """Set of a tenant's embeddings keys, so semantic lookups never scan the keyspace.
+    
+    Members whose keys have expired are pruned by the next lookup that sees them.
+    """
+    return f"{tenant_id}:semantic:index"
+
+
 async def set_cache(
     key: str,
     value: Any,
@@ -61,7 +120,7 @@ async def set_cache(
     
     Args:
         key: Cache key
-        value: Value to cache (will be JSON serialized)
+        value: Value to cache (will be msgpack serialized)
         tenant_id: Tenant identifier
         ttl: Optional TTL in seconds
         embeddings: Optional vector embeddings for semantic caching
@@ -71,15 +130,20 @@ async def set_cache(
     """
     try:
         tenant_key = get_tenant_key(key, tenant_id)
-        json_value = json.dumps({
-            "value": value,
-            "embeddings": embeddings.tolist() if embeddings is not None else None
-        })
+        embeddings_key = get_embeddings_key(tenant_key)
+        index_key = get_semantic_index_key(tenant_id)
+        payload = _cache_encoder.encode(CacheEntry(value=value))
         
+        # SET ... EX applies the TTL in the same command as the write
+        expiry = ttl or None
         async with redis_client.pipeline(transaction=True) as pipe:
-            await pipe.set(tenant_key, json_value)
-            if ttl:
-                await pipe.expire(tenant_key, ttl)
+            await pipe.set(tenant_key, payload, ex=expiry)
+            if embeddings is not None:
+                await pipe.set(embeddings_key, _unit_vector(embeddings).tobytes(), ex=expiry)
+                await pipe.sadd(index_key, embeddings_key)
+            else:
+                await pipe.delete(embeddings_key)
+                await pipe.srem(index_key, embeddings_key)
             await pipe.execute()
             
         logger.debug(
@@ -115,13 +179,13 @@ async def get_cache(key: str, tenant_id: str) -> Optional[Any]:
         cached = await redis_client.get(tenant_key)
         
         if cached:
-            cached_data = json.loads(cached)
+            entry = _cache_decoder.decode(cached)
             logger.debug(
                 "Cache hit",
                 key=key,
                 tenant_id=tenant_id
             )
-            return cached_data["value"]
+            return entry.value
             
         logger.debug(
             "Cache miss",
@@ -163,44 +227,43 @@ async def get_semantic_cache(
         
     try:
         # Get embeddings for input text
-        input_embeddings = EMBEDDING_MODEL.encode(text)
+        input_embeddings = encode_text(text)
         
-        # Get all cached responses for tenant
-        tenant_keys = await redis_client.keys(f"{tenant_id}:*")
-        if not tenant_keys:
+        # Get the embeddings of every cached response for tenant in one round trip
+        index_key = get_semantic_index_key(tenant_id)
+        embeddings_keys = list(await redis_client.smembers(index_key))
+        if not embeddings_keys:
+            return None
+        
+        dimensions = input_embeddings.shape[-1]
+        blobs = await redis_client.mget(embeddings_keys)
+        expired = [embeddings_key for embeddings_key, blob in zip(embeddings_keys, blobs) if blob is None]
+        if expired:
+            await redis_client.srem(index_key, *expired)
+        candidates = [
+            (embeddings_key, blob) for embeddings_key, blob in zip(embeddings_keys, blobs)
+            if blob is not None and len(blob) == dimensions * 4
+        ]
+        if not candidates:
             return None
-            
-        # Get all cached values
-        cached_values = await asyncio.gather(*[
-            redis_client.get(key) for key in tenant_keys
-        ])
+        
+        matrix = np.frombuffer(b"".join(blob for _, blob in candidates), dtype=np.float32)
+        matrix = matrix.reshape(-1, dimensions)
+        
+        # Stored vectors are unit length, so one matrix-vector product against
+        # the normalised query gives every candidate's cosine similarity
+        similarities = matrix @ _unit_vector(input_embeddings)
         
         # Find most similar cached response
-        max_similarity = -1
-        best_match = None
+        best = int(np.argmax(similarities))
+        max_similarity = float(similarities[best])
         
-        for cached in cached_values:
-            if not cached:
-                continue
-                
-            cached_data = json.loads(cached)
-            cached_embeddings = cached_data.get("embeddings")
-            
-            if not cached_embeddings:
-                continue
-                
-            # Calculate cosine similarity
-            similarity = np.dot(
-                input_embeddings,
-                np.array(cached_embeddings)
-            ) / (
-                np.linalg.norm(input_embeddings) *
-                np.linalg.norm(cached_embeddings)
-            )
-            
-            if similarity > max_similarity and similarity >= similarity_threshold:
-                max_similarity = similarity
-                best_match = cached_data["value"]
+        best_match = None
+        if max_similarity >= similarity_threshold:
+            embeddings_key, _ = candidates[best]
+            cached = await redis_client.get(embeddings_key[:-len(":emb")])
+            if cached:
+                best_match = _cache_decoder.decode(cached).value
         
         if best_match:
             logger.debug(
@@ -237,7 +300,11 @@ async def delete_cache(key: str, tenant_id: str) -> bool:
     """
     try:
         tenant_key = get_tenant_key(key, tenant_id)
-        deleted = await redis_client.delete(tenant_key)
+        embeddings_key = get_embeddings_key(tenant_key)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            await pipe.delete(tenant_key, embeddings_key)
+            await pipe.srem(get_semantic_index_key(tenant_id), embeddings_key)
+            deleted, _ = await pipe.execute()
         
         if deleted:
             logger.debug(
@@ -274,14 +341,22 @@ async def clear_tenant_cache(tenant_id: str) -> bool:
         True if successful, False otherwise
     """
     try:
-        tenant_keys = await redis_client.keys(f"{tenant_id}:*")
-        if tenant_keys:
-            await redis_client.delete(*tenant_keys)
+        # Walk the tenant's keys incrementally and UNLINK them in batches, so
+        # neither the scan nor the frees block Redis on large tenants
+        keys_deleted = 0
+        batch = []
+        async for tenant_key in redis_client.scan_iter(match=f"{tenant_id}:*", count=1000):
+            batch.append(tenant_key)
+            if len(batch) >= CLEAR_BATCH_SIZE:
+                keys_deleted += await redis_client.unlink(*batch)
+                batch = []
+        if batch:
+            keys_deleted += await redis_client.unlink(*batch)
             
         logger.info(
             "Tenant cache cleared",
             tenant_id=tenant_id,
-            keys_deleted=len(tenant_keys)
+            keys_deleted=keys_deleted
         )
         return True
         
@@ -38,7 +38,9 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = Field(default="postgres", env="POSTGRES_USER")
     POSTGRES_PASSWORD: str = Field(default="", env="POSTGRES_PASSWORD")
     POSTGRES_DB: str = Field(default="ai_orchestration", env="POSTGRES_DB")
-    POSTGRES_POOL_SIZE: int = Field(default=20, env="POSTGRES_POOL_SIZE")
+    POSTGRES_POOL_SIZE: int = Field(default=20, env="POSTGRES_POOL_SIZE")  # Shared by all workers
+    PGBOUNCER_MODE: bool = Field(default=False, env="PGBOUNCER_MODE")  # Transaction-mode PgBouncer pools instead
+    STATEMENT_CACHE_SIZE: int = Field(default=500, env="STATEMENT_CACHE_SIZE")  # Prepared statements per connection
     DATABASE_URL: Optional[PostgresDsn] = None
 
     @validator("DATABASE_URL", pre=True)
@@ -61,6 +63,7 @@ class Settings(BaseSettings):
     REDIS_PORT: int = Field(default=6379, env="REDIS_PORT")
     REDIS_PASSWORD: str = Field(default="", env="REDIS_PASSWORD")
     REDIS_DB: int = Field(default=0, env="REDIS_DB")
+    REDIS_UNIX_SOCKET: Optional[str] = Field(default=None, env="REDIS_UNIX_SOCKET")  # Used instead of TCP when set
     REDIS_URL: Optional[RedisDsn] = None
 
     @validator("REDIS_URL", pre=True)
@@ -116,6 +119,13 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_WORKFLOWS: int = 100
     RATE_LIMIT_PER_MINUTE: int = 60
     WORKFLOW_TIMEOUT_SECONDS: int = 300  # 5 minutes
+    JOB_WORKERS: int = Field(default=4, env="JOB_WORKERS")
+    JOB_QUEUE_MAXSIZE: int = Field(default=1000, env="JOB_QUEUE_MAXSIZE")
+    JOB_RESULTS_TTL: int = Field(default=86400, env="JOB_RESULTS_TTL")  # 24 hours
+    MAX_JOB_HISTORY: int = Field(default=10000, env="MAX_JOB_HISTORY")
+    BATCH_WINDOW_MS: int = Field(default=50, env="BATCH_WINDOW_MS")  # 0 disables coalescing
+    BATCH_COALESCE_MAX_ITEMS: int = Field(default=256, env="BATCH_COALESCE_MAX_ITEMS")
+    MEMORY_BATCH_WINDOW_MS: int = Field(default=1, env="MEMORY_BATCH_WINDOW_MS")  # 0 reads histories one by one
     
     class Config:
         """Pydantic model configuration."""
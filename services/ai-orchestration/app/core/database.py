@@ -7,27 +7,57 @@ and tenant-scoped session management.
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 import structlog
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
     create_async_engine,
     async_sessionmaker
 )
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
 logger = structlog.get_logger(__name__)
 
-# Create async engine with connection pooling
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    pool_size=settings.POSTGRES_POOL_SIZE,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,  # Recycle connections after 30 minutes
-    pool_pre_ping=True,  # Enable connection health checks
-    echo=settings.DEBUG
-)
+def _worker_share(connections: int) -> int:
+    """A single uvicorn worker's share of a service-wide connection budget."""
+    return max(1, connections // settings.WORKERS)
+
+
+if settings.PGBOUNCER_MODE:
+    # PgBouncer does the pooling. In transaction mode consecutive statements
+    # may run on different server connections, so neither asyncpg nor the
+    # SQLAlchemy adapter may cache prepared statements.
+    engine = create_async_engine(
+        make_url(str(settings.DATABASE_URL)).update_query_dict({"prepared_statement_cache_size": "0"}),
+        poolclass=NullPool,
+        # Statements can't be prepared server side, but SQLAlchemy still
+        # caches the compiled SQL per process
+        query_cache_size=settings.STATEMENT_CACHE_SIZE,
+        connect_args={
+            "statement_cache_size": 0,
+            "server_settings": {"jit": "off"}
+        },
+        echo=settings.DEBUG
+    )
+else:
+    # Create async engine with connection pooling; every worker process gets
+    # its own pool, so each takes its share of the budget. Pooled connections
+    # are long-lived, so repeated queries are prepared once per connection by
+    # both the SQLAlchemy adapter and asyncpg.
+    engine = create_async_engine(
+        make_url(str(settings.DATABASE_URL)).update_query_dict(
+            {"prepared_statement_cache_size": str(settings.STATEMENT_CACHE_SIZE)}
+        ),
+        connect_args={"statement_cache_size": settings.STATEMENT_CACHE_SIZE},
+        pool_size=_worker_share(settings.POSTGRES_POOL_SIZE),
+        max_overflow=_worker_share(10),
+        pool_timeout=30,
+        pool_recycle=1800,  # Recycle connections after 30 minutes
+        pool_pre_ping=True,  # Enable connection health checks
+        echo=settings.DEBUG
+    )
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -69,18 +99,11 @@ async def get_tenant_db(tenant_id: str) -> AsyncGenerator[AsyncSession, None]:
     """
     session = AsyncSessionLocal()
     
-    # Set tenant ID in session info
+    # Set tenant ID in session info; each transaction then sets it for
+    # Postgres row level security (see app.models.base.set_tenant_context)
     session.info["tenant_id"] = tenant_id
     
     try:
-        # Add tenant filter to all queries
-        for mapper in session.registry.mappers:
-            if hasattr(mapper.class_, "__tenant_id__"):
-                session.add_global_filter(
-                    f"{mapper.class_.__name__}_tenant_filter",
-                    lambda cls: cls.__tenant_id__ == tenant_id
-                )
-        
         yield session
         
     except Exception as e:
@@ -0,0 +1,46 @@
+"""Job Index Helpers
+
+This module provides the creation-ordered job keys, sorted index lists and
+opaque pagination cursors shared by the prediction and training job APIs.
+"""
+
+from typing import Any, Dict, List, Tuple
+from bisect import bisect_left
+from datetime import datetime
+import base64
+import binascii
+
+from fastapi import HTTPException, status
+
+# Job keys are (created_at, job_id): unique, and sorted in creation order
+JobKey = Tuple[datetime, str]
+
+
+def job_key(job: Dict[str, Any]) -> JobKey:
+    """Index key for a stored job."""
+    return job["created_at"], job["job_id"]
+
+
+def index_remove(index: List[JobKey], key: JobKey) -> None:
+    """Remove a key from a sorted index list."""
+    position = bisect_left(index, key)
+    if position < len(index) and index[position] == key:
+        del index[position]
+
+
+def encode_cursor(key: JobKey) -> str:
+    """Opaque pagination cursor for the last job on a page."""
+    created_at, job_id = key
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{job_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> JobKey:
+    """Job key encoded in a pagination cursor; 400 if it is malformed."""
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), job_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
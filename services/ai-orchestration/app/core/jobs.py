@@ -0,0 +1,78 @@
+"""Background Job Queue
+
+This module provides a bounded, priority-ordered queue of coroutine jobs
+drained by a fixed pool of worker tasks, so long-running API jobs neither pile
+up unbounded on the event loop nor run ahead of higher-priority work.
+"""
+
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import itertools
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Lower values are dequeued first
+JOB_PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+
+class JobQueue:
+    """Priority queue of coroutine jobs processed by a fixed worker pool."""
+
+    def __init__(self, workers: int, maxsize: int = 0):
+        self._workers = workers
+        self._maxsize = maxsize
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Tie-breaker so equal-priority jobs run in submission order
+        self._sequence = itertools.count()
+
+    def _ensure_started(self) -> asyncio.PriorityQueue:
+        """Create the queue and worker tasks on first use in the running loop."""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue(maxsize=self._maxsize)
+            self._tasks = [
+                asyncio.create_task(self._worker(self._queue), name=f"job-worker-{index}")
+                for index in range(self._workers)
+            ]
+        return self._queue
+
+    async def _worker(self, queue: asyncio.PriorityQueue) -> None:
+        while True:
+            _, _, func, args = await queue.get()
+            try:
+                await func(*args)
+            except Exception as e:
+                logger.error("Background job failed", job=func.__name__, error=str(e), exc_info=True)
+            finally:
+                queue.task_done()
+
+    def enqueue(self, func: JobFunc, *args: Any, priority: str = "normal") -> None:
+        """Queue a job without waiting for it.
+
+        Raises:
+            asyncio.QueueFull: If the queue is at capacity
+        """
+        entry: Tuple[int, int, JobFunc, Tuple[Any, ...]] = (
+            JOB_PRIORITIES.get(priority, JOB_PRIORITIES["normal"]),
+            next(self._sequence),
+            func,
+            args
+        )
+        self._ensure_started().put_nowait(entry)
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs still queued are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+
+# Shared queue for prediction and training jobs
+job_queue = JobQueue(workers=settings.JOB_WORKERS, maxsize=settings.JOB_QUEUE_MAXSIZE)
@@ -4,6 +4,7 @@ This module implements LangGraph agent coordination using StateGraph for
 orchestrating multiple specialized agents.
 """
 
+from types import CodeType
 from typing import Dict, List, Optional
 from uuid import UUID
 
@@ -21,6 +22,16 @@ class AgentCoordinator:
     def __init__(self):
         """Initialize agent coordinator."""
         self.graph = StateGraph()
+        # Transition conditions compiled once, keyed by their source
+        self._conditions: Dict[str, CodeType] = {}
+        
+    def _compile_condition(self, condition: str) -> CodeType:
+        """Compile a transition condition, reusing earlier compilations."""
+        code = self._conditions.get(condition)
+        if code is None:
+            code = compile(condition, "<condition>", "eval")
+            self._conditions[condition] = code
+        return code
         
     def add_agent_node(
         self,
@@ -62,7 +73,13 @@ class AgentCoordinator:
             from_state: Source state name
             to_state: Target state name 
             condition: Optional transition condition
+            
+        Raises:
+            SyntaxError: If condition is not a valid expression
         """
+        if condition is not None:
+            self._compile_condition(condition)
+            
         self.graph.add_edge(
             from_state,
             to_state,
@@ -90,7 +107,8 @@ class AgentCoordinator:
             if transition.condition is None:
                 return transition.target
                 
-            if eval(transition.condition, {"context": context}):
+            code = self._compile_condition(transition.condition)
+            if eval(code, {"__builtins__": {}}, {"context": context}):
                 return transition.target
                 
         # No valid transition found
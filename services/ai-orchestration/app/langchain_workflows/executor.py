@@ -5,8 +5,9 @@ orchestrating AI workflows with error handling, monitoring and optimization.
 """
 
 import asyncio
+import time
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from langchain.llms import BaseLLM
@@ -67,12 +68,14 @@ class WorkflowExecutor:
         Raises:
             WorkflowExecutionError: If workflow execution fails
         """
-        # Initialize workflow execution
-        start_time = datetime.utcnow()
+        # Initialize workflow execution; the duration comes from the
+        # monotonic clock, and the wall clock is read only once
+        start_time = datetime.now(timezone.utc)
+        started = time.perf_counter()
         
         try:
             # Load workflow memory and context
-            memory = await self.memory_manager.get_memory(workflow_id)
+            memory = await self.memory_manager.get_memory(workflow_id, llm=self.llm)
             
             # Get workflow prompt template
             prompt = self.prompt_manager.get_prompt(workflow_id)
@@ -92,8 +95,8 @@ class WorkflowExecutor:
             )
             
             # Record metrics and return result
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.perf_counter() - started
+            end_time = start_time + timedelta(seconds=duration)
             
             return WorkflowResult(
                 workflow_id=workflow_id,
@@ -106,8 +109,8 @@ class WorkflowExecutor:
             
         except Exception as e:
             # Handle workflow execution errors
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.perf_counter() - started
+            end_time = start_time + timedelta(seconds=duration)
             
             return WorkflowResult(
                 workflow_id=workflow_id,
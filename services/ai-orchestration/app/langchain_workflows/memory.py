@@ -4,14 +4,86 @@ This module implements conversation memory management with Redis backend
 and intelligent context window handling.
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
+import asyncio
+import json
 
-from langchain.memory import ConversationBufferMemory, RedisChatMessageHistory
+from langchain.memory import (
+    ConversationBufferMemory,
+    ConversationTokenBufferMemory,
+    RedisChatMessageHistory
+)
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.schema import BaseMessage, message_to_dict, messages_from_dict
+from langchain.schema.language_model import BaseLanguageModel
 from pydantic import BaseModel
+from redis import Redis
 
 from app.core.config import settings
 
+# Memories kept for reuse across lookups, least recently used evicted first
+MAX_CACHED_MEMORIES = 1024
+
+
+def _history_stop(max_messages: Optional[int]) -> int:
+    """LRANGE/LTRIM stop index covering the newest max_messages items."""
+    return max_messages - 1 if max_messages else -1
+
+
+class SharedRedisChatMessageHistory(RedisChatMessageHistory):
+    """Redis chat history on an existing client.
+    
+    RedisChatMessageHistory opens its own client per instance; this reuses
+    the memory manager's connection pool instead. The first read can be
+    served from items the manager already fetched in a batch. With
+    max_messages set, the list is trimmed on every write and only that many
+    messages are ever read back.
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        redis_client: Redis,
+        key_prefix: str = "memory:",
+        ttl: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        prefetched: Optional[List[bytes]] = None
+    ):
+        self.redis_client = redis_client
+        self.session_id = session_id
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self._prefetched = prefetched
+        
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore
+        """Retrieve the messages from Redis, or from the prefetched items once."""
+        if self._prefetched is None:
+            items = self.redis_client.lrange(self.key, 0, _history_stop(self.max_messages))
+        else:
+            items, self._prefetched = self._prefetched, None
+        # Stored newest first by LPUSH
+        return messages_from_dict([json.loads(item.decode("utf-8")) for item in items[::-1]])
+        
+    def add_message(self, message: BaseMessage) -> None:
+        """Append the message to Redis, dropping any unread prefetched items."""
+        self._prefetched = None
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.lpush(self.key, json.dumps(message_to_dict(message)))
+            if self.max_messages:
+                pipe.ltrim(self.key, 0, _history_stop(self.max_messages))
+            if self.ttl:
+                pipe.expire(self.key, self.ttl)
+            pipe.execute()
+        
+    def clear(self) -> None:
+        """Clear session memory from Redis."""
+        self._prefetched = None
+        super().clear()
+
 
 class MemoryManager:
     """Manages conversation memory with Redis backend."""
@@ -23,35 +95,132 @@ class MemoryManager:
             redis_url: Optional Redis connection URL
         """
         self.redis_url = redis_url or settings.REDIS_URL
+        # LangChain's chat history is synchronous, so it gets its own pool
+        # rather than the async one in app.core.cache
+        self.redis_client = Redis.from_url(str(self.redis_url), max_connections=20)
+        # Memories handed out, so repeated lookups within a workflow share one
+        # instance. LangChain memories are pydantic v1 models, which can't be
+        # weakly referenced, so the cache is a bounded LRU instead.
+        self._memories: "OrderedDict[Tuple[str, int, Optional[int]], BaseChatMemory]" = OrderedDict()
+        # History reads requested within one MEMORY_BATCH_WINDOW_MS, by key
+        # and message limit; they are fetched together in a single pipeline
+        self._pending_reads: Dict[Tuple[str, Optional[int]], "asyncio.Future[List[bytes]]"] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        
+    def _read_histories(self, reads: List[Tuple[str, Optional[int]]]) -> List[List[bytes]]:
+        """Fetch several history lists in one round trip."""
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            for key, max_messages in reads:
+                pipe.lrange(key, 0, _history_stop(max_messages))
+            return pipe.execute()
+        
+    async def _flush_history_reads(self) -> None:
+        """Background task to fetch the history reads queued in one window."""
+        await asyncio.sleep(settings.MEMORY_BATCH_WINDOW_MS / 1000)
+        pending, self._pending_reads = self._pending_reads, {}
+        
+        try:
+            # The client is synchronous; keep the round trip off the event loop
+            results = await asyncio.to_thread(self._read_histories, list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, items in zip(pending.values(), results):
+            if not future.done():
+                future.set_result(items)
+                
+    async def _fetch_history(self, key: str, max_messages: Optional[int] = None) -> List[bytes]:
+        """Fetch a history list, batched with concurrent fetches.
+        
+        Args:
+            key: Redis key of the history list
+            max_messages: Optional number of newest messages to fetch
+            
+        Returns:
+            Raw list items, newest first
+        """
+        if settings.MEMORY_BATCH_WINDOW_MS <= 0:
+            return await asyncio.to_thread(self.redis_client.lrange, key, 0, _history_stop(max_messages))
+        
+        read = (key, max_messages)
+        future = self._pending_reads.get(read)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            if not self._pending_reads:
+                self._flush_task = loop.create_task(self._flush_history_reads())
+            self._pending_reads[read] = future
+        # Several lookups may share one read; a cancelled one must not
+        # cancel it for the others
+        return await asyncio.shield(future)
         
     async def get_memory(
         self,
         workflow_id: UUID,
-        window_size: int = 10
-    ) -> ConversationBufferMemory:
+        window_size: int = 10,
+        llm: Optional[BaseLanguageModel] = None
+    ) -> BaseChatMemory:
         """Get conversation memory for workflow.
         
         Args:
             workflow_id: Workflow to get memory for
-            window_size: Max messages to keep in context
+            window_size: Max exchanges (human and AI message pairs) to keep
+            llm: Optional model whose tokenizer bounds the context size
             
         Returns:
-            ConversationBufferMemory instance
+            ConversationTokenBufferMemory if llm is given, otherwise
+            ConversationBufferMemory
         """
-        # Initialize Redis chat history
-        history = RedisChatMessageHistory(
-            url=self.redis_url,
+        # The memory class and its token counting depend on the model, so
+        # each model gets its own entry; a cached token buffer memory holds
+        # its llm, which keeps the id from being reused while it is cached
+        key = (str(workflow_id), window_size, id(llm) if llm is not None else None)
+        memory = self._memories.get(key)
+        if memory is not None:
+            self._memories.move_to_end(key)
+            return memory
+        
+        # Initialize Redis chat history; concurrent lookups for other
+        # workflows share one Redis round trip for the initial read
+        max_messages = window_size * 2
+        prefetched = await self._fetch_history(f"memory:{workflow_id}", max_messages)
+        
+        # Another lookup for this workflow may have finished while waiting
+        memory = self._memories.get(key)
+        if memory is not None:
+            self._memories.move_to_end(key)
+            return memory
+        
+        history = SharedRedisChatMessageHistory(
             session_id=str(workflow_id),
-            key_prefix="memory:"
+            redis_client=self.redis_client,
+            key_prefix="memory:",
+            max_messages=max_messages,
+            prefetched=prefetched
         )
         
-        # Create memory with history
-        return ConversationBufferMemory(
-            chat_memory=history,
-            memory_key="chat_history",
-            return_messages=True,
-            max_token_limit=window_size * 1000  # Approximate token limit
-        )
+        # Create memory with history; counting tokens needs the model
+        if llm is not None:
+            memory = ConversationTokenBufferMemory(
+                llm=llm,
+                chat_memory=history,
+                memory_key="chat_history",
+                return_messages=True,
+                max_token_limit=window_size * 1000  # Approximate token limit
+            )
+        else:
+            memory = ConversationBufferMemory(
+                chat_memory=history,
+                memory_key="chat_history",
+                return_messages=True
+            )
+        self._memories[key] = memory
+        if len(self._memories) > MAX_CACHED_MEMORIES:
+            self._memories.popitem(last=False)
+        return memory
         
     async def clear_memory(self, workflow_id: UUID) -> None:
         """Clear conversation memory for workflow.
@@ -59,9 +228,15 @@ class MemoryManager:
         Args:
             workflow_id: Workflow to clear memory for
         """
-        history = RedisChatMessageHistory(
-            url=self.redis_url,
+        # Drop the workflow's memories; ones already handed out must not
+        # serve prefetched history from before the clear
+        session_id = str(workflow_id)
+        for key in [key for key in self._memories if key[0] == session_id]:
+            self._memories.pop(key).chat_memory.clear()
+        
+        history = SharedRedisChatMessageHistory(
             session_id=str(workflow_id),
+            redis_client=self.redis_client,
             key_prefix="memory:"
         )
-        await history.clear()
+        history.clear()
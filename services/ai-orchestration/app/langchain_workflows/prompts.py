@@ -4,23 +4,66 @@ This module manages versioned prompt templates with A/B testing capabilities
 and tenant customization support.
 """
 
-from typing import Dict, Optional
+from hashlib import blake2b
+from string import Formatter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 from uuid import UUID
 
 from langchain.prompts import PromptTemplate
-from pydantic import BaseModel
+from packaging.version import InvalidVersion, Version
+from pydantic import BaseModel, Field
 
+from app.core.cache import get_cache, set_cache
 from app.core.config import settings
 
 
 class PromptVersion(BaseModel):
     """Prompt template version with metadata."""
     
+    model_config = {"arbitrary_types_allowed": True}
+    
     version: str
     template: str
     description: Optional[str] = None
     is_active: bool = True
     parameters: Dict[str, str] = {}
+    # Leading lines without parameters, which provider prompt caches can
+    # reuse across calls, and the remainder starting at the first parameter
+    cache_prefix: Optional[str] = None
+    cache_body: Optional[str] = None
+    # Parsed and validated once at registration; versions are immutable
+    compiled: PromptTemplate = Field(exclude=True)
+    compiled_prefix: PromptTemplate = Field(exclude=True)
+    compiled_body: PromptTemplate = Field(exclude=True)
+
+
+def _split_cacheable_prefix(template: str) -> Tuple[str, str]:
+    """Split a template before the first line that references a parameter.
+    
+    Args:
+        template: Prompt template string
+        
+    Returns:
+        Tuple of static prefix and parameterized body; either may be empty
+    """
+    offset = 0
+    for line in template.splitlines(keepends=True):
+        if any(field is not None for _, field, _, _ in Formatter().parse(line)):
+            return template[:offset], template[offset:]
+        offset += len(line)
+    return template, ""
+
+
+def _version_key(version: str) -> Tuple[int, Any]:
+    """Sort key ordering versions numerically ("10" after "9").
+    
+    Identifiers that aren't PEP 440 versions sort before all that are, and
+    among themselves as plain strings.
+    """
+    try:
+        return (1, Version(version))
+    except InvalidVersion:
+        return (0, version)
 
 
 class PromptManager:
@@ -29,6 +72,8 @@ class PromptManager:
     def __init__(self):
         """Initialize prompt template storage."""
         self.templates: Dict[UUID, Dict[str, PromptVersion]] = {}
+        # Highest active version per workflow, kept up to date on register
+        self.latest_active: Dict[UUID, PromptVersion] = {}
         
     def register_prompt(
         self,
@@ -53,19 +98,35 @@ class PromptManager:
         if workflow_id not in self.templates:
             self.templates[workflow_id] = {}
             
+        parameters = parameters or {}
+        prefix, body = _split_cacheable_prefix(template)
         prompt_version = PromptVersion(
             version=version,
             template=template,
             description=description,
-            parameters=parameters or {}
+            parameters=parameters,
+            cache_prefix=prefix or None,
+            cache_body=body or None,
+            compiled=PromptTemplate(
+                template=template,
+                input_variables=list(parameters.keys())
+            ),
+            compiled_prefix=PromptTemplate(template=prefix, input_variables=[]),
+            compiled_body=PromptTemplate(
+                template=body,
+                input_variables=list(parameters.keys())
+            )
         )
         
         self.templates[workflow_id][version] = prompt_version
         
-        return PromptTemplate(
-            template=template,
-            input_variables=list(prompt_version.parameters.keys())
-        )
+        latest = self.latest_active.get(workflow_id)
+        if prompt_version.is_active and (
+            latest is None or _version_key(version) >= _version_key(latest.version)
+        ):
+            self.latest_active[workflow_id] = prompt_version
+        
+        return prompt_version.compiled
         
     def get_prompt(
         self,
@@ -84,6 +145,79 @@ class PromptManager:
         Raises:
             KeyError: If workflow or version not found
         """
+        return self._get_version(workflow_id, version).compiled
+        
+    def get_prompt_parts(
+        self,
+        workflow_id: UUID,
+        version: Optional[str] = None
+    ) -> Tuple[PromptTemplate, PromptTemplate]:
+        """Get prompt template for workflow split for provider prompt caching.
+        
+        The prefix holds the leading lines that reference no parameters, so
+        callers can mark it cacheable (e.g. Anthropic's cache_control); the
+        body holds the rest. Either template may be empty.
+        
+        Args:
+            workflow_id: Workflow to get prompt for
+            version: Optional specific version to get
+            
+        Returns:
+            Tuple of static prefix and parameterized body templates
+            
+        Raises:
+            KeyError: If workflow or version not found
+        """
+        prompt_version = self._get_version(workflow_id, version)
+        return prompt_version.compiled_prefix, prompt_version.compiled_body
+        
+    async def render_and_resolve(
+        self,
+        workflow_id: UUID,
+        tenant_id: str,
+        resolve: Callable[[str], Awaitable[str]],
+        version: Optional[str] = None,
+        model_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> str:
+        """Render a prompt and resolve it, reusing earlier outputs for it.
+        
+        Outputs are cached per tenant, workflow, prompt version and model
+        under a hash of the rendered prompt, so a render that matches an
+        earlier one exactly skips the model, while a new prompt version or
+        a different model never reuses another one's output.
+        
+        Args:
+            workflow_id: Workflow to get prompt for
+            tenant_id: Tenant identifier
+            resolve: Coroutine function sending a rendered prompt to the model
+            version: Optional specific version to use
+            model_id: Optional identifier of the model `resolve` calls
+            **kwargs: Template parameter values
+            
+        Returns:
+            Model output for the rendered prompt
+            
+        Raises:
+            KeyError: If workflow or version not found
+        """
+        prompt_version = self._get_version(workflow_id, version)
+        rendered = prompt_version.compiled.format(**kwargs)
+        digest = blake2b(rendered.encode(), digest_size=16).hexdigest()
+        key = f"prompt_output:{workflow_id}:{prompt_version.version}:{model_id or ''}:{digest}"
+        
+        output = await get_cache(key, tenant_id)
+        if output is None:
+            output = await resolve(rendered)
+            await set_cache(key, output, tenant_id, ttl=settings.CACHE_TTL)
+        return output
+        
+    def _get_version(
+        self,
+        workflow_id: UUID,
+        version: Optional[str] = None
+    ) -> PromptVersion:
+        """Look up a registered version, the latest active one by default."""
         if workflow_id not in self.templates:
             raise KeyError(f"No prompts registered for workflow {workflow_id}")
             
@@ -97,13 +231,8 @@ class PromptManager:
                 raise KeyError(f"Version {version} not found")
             prompt_version = templates[version]
         else:
-            # Get latest active version
-            prompt_version = max(
-                (v for v in templates.values() if v.is_active),
-                key=lambda v: v.version
-            )
+            if workflow_id not in self.latest_active:
+                raise KeyError(f"No active prompt version for workflow {workflow_id}")
+            prompt_version = self.latest_active[workflow_id]
             
-        return PromptTemplate(
-            template=prompt_version.template,
-            input_variables=list(prompt_version.parameters.keys())
-        )
+        return prompt_version
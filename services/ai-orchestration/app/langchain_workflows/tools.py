@@ -4,7 +4,7 @@ This module implements LangChain tools for CRM data access, communication
 and analytics integrations.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from langchain.tools import BaseTool
@@ -36,8 +36,10 @@ class ToolRegistry:
         self.communication_service = communication_service
         self.analytics_service = analytics_service
         
-        # Initialize tools
-        self.tools = self._create_tools()
+        # Initialize tools, indexed by name for dispatch; the set is fixed,
+        # so it is kept as a tuple callers can share without copying
+        self.tools: Tuple[BaseTool, ...] = tuple(self._create_tools())
+        self._tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in self.tools}
         
     def _create_tools(self) -> List[BaseTool]:
         """Create list of available tools.
@@ -68,13 +70,13 @@ class ToolRegistry:
         
         return tools
         
-    def get_tools(self) -> List[BaseTool]:
-        """Get list of all available tools.
+    def get_tools(self) -> Tuple[BaseTool, ...]:
+        """Get all available tools.
         
         Returns:
-            List of tool instances
+            Immutable tuple of tool instances
         """
-        return self.tools.copy()
+        return self.tools
         
     def get_tool(self, tool_name: str) -> Optional[BaseTool]:
         """Get specific tool by name.
@@ -85,10 +87,7 @@ class ToolRegistry:
         Returns:
             Tool instance if found, else None
         """
-        return next(
-            (tool for tool in self.tools if tool.name == tool_name),
-            None
-        )
+        return self._tools_by_name.get(tool_name)
         
     def _create_contact_tool(self) -> BaseTool:
         """Create tool for contact operations."""
@@ -4,14 +4,20 @@ This module initializes the FastAPI application with middleware, error handling,
 health endpoints, and routing for AI orchestration capabilities.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import time
 from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
+
+import orjson
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import structlog
 import uvicorn
 from sqlalchemy import text
@@ -19,9 +25,25 @@ from sqlalchemy import text
 from app.core.config import settings
 from app.core.database import engine
 from app.core.cache import redis_client
+from app.core.jobs import job_queue
 from app.api.v1 import api_router
 
-# Configure structured logging
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record (and the event
+        # dict structlog put in it) can be handed over as is
+        return record
+
+
+def _orjson_dumps(obj, **kwargs) -> str:
+    """JSON serializer for structlog's renderer."""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+# Configure structured logging; events are only queued on the request path,
+# and JSON rendering and the write happen on the listener thread
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
@@ -32,7 +54,7 @@ structlog.configure(
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -40,6 +62,22 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+    processor=structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+))
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+
+logging.getLogger().addHandler(_DeferredQueueHandler(_log_queue))
+logging.getLogger().setLevel(settings.LOG_LEVEL)
+
+# Run the listener for as long as the handler is installed, so records logged
+# before startup or after a failed startup are written too; stopping it at
+# exit flushes what is still queued
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = structlog.get_logger(__name__)
 
 
@@ -70,6 +108,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down AI/ML Orchestration Service")
+    await job_queue.stop()
     await engine.dispose()
     await redis_client.close()
 
@@ -81,6 +120,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -100,46 +140,58 @@ app.add_middleware(
 )
 
 
+# Probe and info endpoints polled by Kubernetes and load balancers; logging
+# every hit would only add noise and per-request cost
+_UNLOGGED_PATHS = frozenset({"/health", "/health/ready", "/"})
+
+
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
     """Log all HTTP requests with performance metrics."""
-    start_time = time.time()
+    if request.scope["path"] in _UNLOGGED_PATHS:
+        return await call_next(request)
+    
+    # Monotonic, so clock adjustments can't skew the measured time
+    start_ns = time.monotonic_ns()
     
     # Extract tenant context if available
     tenant_id = request.headers.get("X-Tenant-ID", "unknown")
+    method = request.method
+    url = str(request.url)
+    client = request.client
     
     logger.info(
         "Request started",
-        method=request.method,
-        url=str(request.url),
+        method=method,
+        url=url,
         tenant_id=tenant_id,
-        client_ip=request.client.host if request.client else None
+        client_ip=client.host if client else None
     )
     
     try:
         response = await call_next(request)
-        process_time = time.time() - start_time
+        process_time = (time.monotonic_ns() - start_ns) / 1e9
         
         logger.info(
             "Request completed",
-            method=request.method,
-            url=str(request.url),
+            method=method,
+            url=url,
             tenant_id=tenant_id,
             status_code=response.status_code,
             process_time=round(process_time, 4)
         )
         
         # Add performance header
-        response.headers["X-Process-Time"] = str(process_time)
+        response.headers["X-Process-Time"] = f"{process_time:.4f}"
         return response
         
     except Exception as e:
-        process_time = time.time() - start_time
+        process_time = (time.monotonic_ns() - start_ns) / 1e9
         
         logger.error(
             "Request failed",
-            method=request.method,
-            url=str(request.url),
+            method=method,
+            url=url,
             tenant_id=tenant_id,
             process_time=round(process_time, 4),
             error=str(e),
@@ -156,16 +208,33 @@ async def logging_middleware(request: Request, call_next):
         )
 
 
+# Static response bodies, encoded once; the liveness body only needs the
+# current timestamp spliced onto its fixed prefix
+_HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "service": "ai-ml-orchestration",
+    "version": "0.1.0"
+})[:-1] + b',"timestamp":'
+
+_ROOT_BODY = orjson.dumps({
+    "service": "AI/ML Orchestration Service",
+    "description": "Intelligent automation engine for CRM platform AI capabilities",
+    "version": "0.1.0",
+    "status": "running",
+    "docs_url": "/docs" if settings.DEBUG else "disabled in production"
+})
+
+
+def _health_body() -> bytes:
+    """Liveness response body with the current timestamp."""
+    return _HEALTH_PREFIX + repr(time.time()).encode() + b"}"
+
+
 # Health check endpoints
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Basic health check endpoint."""
-    return {
-        "status": "healthy",
-        "service": "ai-ml-orchestration",
-        "version": "0.1.0",
-        "timestamp": time.time()
-    }
+    return Response(content=_health_body(), media_type="application/json")
 
 
 @app.get("/health/ready", tags=["Health"])
@@ -192,27 +261,20 @@ async def readiness_check():
         all_healthy = False
     
     status_code = 200 if all_healthy else 503
-    return Response(
-        content=str({
+    return ORJSONResponse(
+        content={
             "status": "ready" if all_healthy else "not_ready",
             "checks": checks,
             "timestamp": time.time()
-        }),
-        status_code=status_code,
-        media_type="application/json"
+        },
+        status_code=status_code
     )
 
 
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with service information."""
-    return {
-        "service": "AI/ML Orchestration Service",
-        "description": "Intelligent automation engine for CRM platform AI capabilities",
-        "version": "0.1.0",
-        "status": "running",
-        "docs_url": "/docs" if settings.DEBUG else "disabled in production"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # Include API routes
@@ -244,10 +306,38 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Static GET endpoints answered before the application; their bodies need no
+# I/O, so they skip middleware, routing and exception handling entirely.
+# The readiness probe does real checks and stays on the regular route.
+_BARE_ROUTES: Dict[str, Callable[[], bytes]] = {
+    "/health": _health_body,
+    "/": lambda: _ROOT_BODY
+}
+
+
+async def asgi_app(scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+    """ASGI entry point serving _BARE_ROUTES directly and the app otherwise."""
+    if scope["type"] == "http" and scope["method"] == "GET":
+        render = _BARE_ROUTES.get(scope["path"])
+        if render is not None:
+            body = render()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+    await app(scope, receive, send)
+
+
 # Development server
 if __name__ == "__main__":
     uvicorn.run(
-        "app.main:app",
+        "app.main:asgi_app",
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
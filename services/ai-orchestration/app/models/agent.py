@@ -4,13 +4,16 @@ This module defines the database models for LangGraph agent state management,
 inter-agent communication, and workflow coordination.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from enum import Enum
+import time
 
-from sqlalchemy import Column, DateTime, String, JSON, ForeignKey, Enum as SQLAEnum, Integer
+from sqlalchemy import Column, DateTime, String, JSON, ForeignKey, Enum as SQLAEnum, Integer, inspect
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.sql import ClauseElement
 
 from app.models.base import Base
 
@@ -32,6 +35,11 @@ class AgentStatus(str, Enum):
     FAILED = "failed"
 
 
+def _utcnow() -> datetime:
+    """Timezone-aware current UTC time."""
+    return datetime.now(timezone.utc)
+
+
 class AgentAction(Base):
     """Individual action taken by an agent."""
     
@@ -40,7 +48,7 @@ class AgentAction(Base):
     description = Column(String, nullable=False)
     
     # Execution timing
-    started_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
     completed_at = Column(DateTime(timezone=True))
     duration = Column(Integer)  # milliseconds
     
@@ -89,7 +97,8 @@ class AgentState(Base):
     # Execution state
     current_observation = Column(JSON)
     next_action = Column(JSON)
-    action_queue = Column(JSON, default=list)
+    action_queue = Column(JSON, default=list)  # Append-only until compacted
+    queue_head = Column(Integer, nullable=False, default=0)  # Index of the next queued action
     
     # Dependencies and coordination
     depends_on = Column(JSON, default=list)  # List of agent IDs this agent depends on
@@ -132,10 +141,13 @@ class AgentState(Base):
             action_type=action_type,
             description=description,
             input_data=input_data,
-            success=AgentStatus.WORKING
+            success=AgentStatus.WORKING,
+            started_at=_utcnow()
         )
+        # Not persisted; times the action if it completes in this process
+        action._perf_start_ns = time.perf_counter_ns()
         self.execution_history.append(action)
-        self.total_actions += 1
+        self._increment(total_actions=1)
         return action
     
     def complete_action(
@@ -155,8 +167,13 @@ class AgentState(Base):
             cost: Cost in microcents
             error: Optional error information
         """
-        action.completed_at = datetime.utcnow()
-        action.duration = int((action.completed_at - action.started_at).total_seconds() * 1000)
+        action.completed_at = _utcnow()
+        perf_start_ns = getattr(action, "_perf_start_ns", None)
+        if perf_start_ns is not None:
+            action.duration = (time.perf_counter_ns() - perf_start_ns) // 1_000_000
+        else:
+            # Loaded from the database; fall back to the recorded start
+            action.duration = int((action.completed_at - action.started_at).total_seconds() * 1000)
         action.output_data = output_data
         action.tokens_used = tokens_used
         action.cost = cost
@@ -164,13 +181,33 @@ class AgentState(Base):
         if error:
             action.success = AgentStatus.FAILED
             action.error = error
-            self.failed_actions += 1
+            self._increment(failed_actions=1, total_tokens=tokens_used, total_cost=cost)
         else:
             action.success = AgentStatus.COMPLETED
-            self.successful_actions += 1
+            self._increment(successful_actions=1, total_tokens=tokens_used, total_cost=cost)
+    
+    def _increment(self, **amounts: int) -> None:
+        """Add to performance counters.
+        
+        Once the row exists the additions are flushed as SET col = col + n,
+        so the database does the arithmetic and concurrent workers updating
+        the same agent don't overwrite each other's counts. The counters are
+        expired by the flush and must be refreshed to be read again.
         
-        self.total_tokens += tokens_used
-        self.total_cost += cost
+        Args:
+            **amounts: Amount to add, by counter column name
+        """
+        state = inspect(self)
+        for name, amount in amounts.items():
+            current = state.dict.get(name)
+            if isinstance(current, ClauseElement):
+                # Increment already pending for this flush
+                value = current + amount
+            elif state.persistent:
+                value = getattr(type(self), name) + amount
+            else:
+                value = (current or 0) + amount
+            setattr(self, name, value)
     
     def update_memory(
         self,
@@ -213,13 +250,29 @@ class AgentState(Base):
         if not isinstance(self.action_queue, list):
             self.action_queue = []
         self.action_queue.append(action)
+        # Plain JSON columns don't track in-place changes
+        flag_modified(self, "action_queue")
     
     def get_next_queued_action(self) -> Optional[Dict[str, Any]]:
         """Get next action from queue.
         
+        Dequeuing only advances queue_head, so the queue itself is rewritten
+        only when it is compacted.
+        
         Returns:
             Next queued action if available, None otherwise
         """
-        if not self.action_queue:
+        head = self.queue_head or 0
+        if not self.action_queue or head >= len(self.action_queue):
             return None
-        return self.action_queue.pop(0)
+        
+        action = self.action_queue[head]
+        self.queue_head = head + 1
+        if self.queue_head * 2 > len(self.action_queue):
+            self._compact_queue()
+        return action
+    
+    def _compact_queue(self) -> None:
+        """Drop consumed actions once they make up over half the queue."""
+        self.action_queue = self.action_queue[self.queue_head:]
+        self.queue_head = 0
@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict
 
-from sqlalchemy import Column, DateTime, String, event
+from sqlalchemy import Column, DateTime, String, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase, Session
@@ -58,3 +58,39 @@ def enforce_tenant_isolation(session: Session, *args: Any) -> None:
             # Set tenant ID if not already set
             if not obj.tenant_id:
                 obj.tenant_id = tenant_id
+
+
+@event.listens_for(Session, "after_begin")
+def set_tenant_context(session: Session, transaction: Any, connection: Any) -> None:
+    """Scope each transaction of a tenant session to its tenant in Postgres.
+    
+    Row level security policies read app.tenant_id; set_config(..., true)
+    keeps it local to the transaction, so pooled connections never carry a
+    tenant over to the next session.
+    """
+    tenant_id = session.info.get("tenant_id")
+    if tenant_id:
+        connection.execute(
+            text("SELECT set_config('app.tenant_id', :tenant_id, true)"),
+            {"tenant_id": str(tenant_id)}
+        )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def enable_tenant_row_security(target: Any, connection: Any, **kw: Any) -> None:
+    """Restrict every tenant-scoped table to rows of the session's tenant.
+    
+    Table owners bypass these policies, so the service should connect as a
+    role that does not own the tables. Only tables this create_all actually
+    created get a policy; existing ones already have theirs.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for table in kw["tables"]:
+        if "tenant_id" not in table.c:
+            continue
+        connection.execute(text(f'ALTER TABLE "{table.name}" ENABLE ROW LEVEL SECURITY'))
+        connection.execute(text(
+            f'CREATE POLICY tenant_isolation ON "{table.name}" '
+            "USING (tenant_id = current_setting('app.tenant_id', true)::uuid)"
+        ))
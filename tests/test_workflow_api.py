@@ -0,0 +1,65 @@
+"""Tests for the workflow engine REST endpoints."""
+
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("langgraph")
+pytest.importorskip("google.cloud.firestore")
+pytest.importorskip("google.cloud.pubsub_v1")
+
+import google.auth
+from google.auth.credentials import AnonymousCredentials
+
+from app.workflow_engine import WorkflowDefinition
+from app.workflow_engine.triggers import TriggerManager, TriggerType
+
+
+class _InMemoryStorage:
+    """Stands in for Firestore; keeps saved workflows in a dict."""
+    
+    def __init__(self):
+        self.workflows: Dict[str, WorkflowDefinition] = {}
+        
+    async def save_workflow(self, workflow: WorkflowDefinition) -> str:
+        self.workflows[workflow.id] = workflow
+        return workflow.id
+
+
+@pytest.fixture
+def api(monkeypatch):
+    # The module creates its Google Cloud clients and default LLM at import time
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(google.auth, "default", lambda *args, **kwargs: (AnonymousCredentials(), "test"))
+    from app.workflow_engine import api
+    
+    monkeypatch.setattr(api, "workflow_storage", _InMemoryStorage())
+    monkeypatch.setattr(api, "trigger_manager", TriggerManager())
+    return api
+
+
+@pytest.mark.asyncio
+async def test_create_workflow_registers_dict_trigger(api):
+    workflow = WorkflowDefinition(
+        name="welcome",
+        trigger={
+            "type": "CONTACT_CREATED",
+            "conditions": [{"field": "source", "operator": "equals", "value": "web"}]
+        },
+        steps=[],
+        owner="tests"
+    )
+    fired: List[Tuple[str, Dict[str, Any]]] = []
+    
+    async def handler(workflow_id: str, event_data: Dict[str, Any]):
+        fired.append((workflow_id, event_data))
+    
+    api.trigger_manager.register_event_handler(TriggerType.CONTACT_CREATED, handler)
+    
+    await api.create_workflow(workflow)
+    await api.trigger_manager.evaluate_event(TriggerType.CONTACT_CREATED, {"source": "web"})
+    await api.trigger_manager.evaluate_event(TriggerType.CONTACT_CREATED, {"source": "import"})
+    
+    assert workflow.id in api.workflow_storage.workflows
+    assert fired == [(workflow.id, {"source": "web"})]
@@ -0,0 +1,112 @@
+"""Tests for the LangGraph state graph built by the workflow executor."""
+
+from typing import Any, Dict
+
+import pytest
+
+pytest.importorskip("langgraph")
+pytest.importorskip("langchain")
+pytest.importorskip("google.cloud.firestore")
+
+from app.workflow_engine import WorkflowDefinition
+from app.workflow_engine.executor import WorkflowExecutor, register_step
+
+
+@register_step("TEST_SET_VARIABLE")
+def _build_set_variable_node(step_config: Dict[str, Any], executor: WorkflowExecutor) -> Any:
+    """Node setting one variable, to observe which steps ran."""
+    def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        return {step_config["name"]: state["input"]}
+    return node
+
+
+def _two_branch_workflow() -> WorkflowDefinition:
+    """start fans out to left and right, which both join into end."""
+    def step(step_id: str, *next_steps: str) -> Dict[str, Any]:
+        return {
+            "id": step_id,
+            "type": "TEST_SET_VARIABLE",
+            "config": {"name": step_id},
+            "next_steps": list(next_steps)
+        }
+
+    return WorkflowDefinition(
+        name="two branches",
+        trigger={"type": "manual"},
+        steps=[
+            step("start", "left", "right"),
+            step("left", "end"),
+            step("right", "end"),
+            step("end")
+        ],
+        owner="tests"
+    )
+
+
+@pytest.fixture
+def executor() -> WorkflowExecutor:
+    # The LLM is only used by AI_DECISION steps
+    return WorkflowExecutor(llm=object())
+
+
+@pytest.mark.asyncio
+async def test_build_state_graph_compiles_two_branches(executor):
+    state_graph = await executor._build_state_graph(_two_branch_workflow())
+
+    graph = state_graph.compile()
+
+    assert {"start", "left", "right", "end"} <= set(graph.get_graph().nodes)
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_merges_parallel_branches(executor):
+    execution = await executor.execute_workflow(_two_branch_workflow(), {"input": 42})
+
+    assert execution.status == "COMPLETED", execution.error
+    assert {"start", "left", "right", "end"} <= execution.result.keys()
+    assert execution.result["left"] == execution.result["right"] == 42
+
+
+@pytest.mark.asyncio
+async def test_steps_without_runnable_handler_fail_execution(executor):
+    workflow = WorkflowDefinition(
+        name="email",
+        trigger={"type": "manual"},
+        steps=[{"id": "notify", "type": "SEND_EMAIL", "config": {"recipients": ["a@example.com"]}}],
+        owner="tests"
+    )
+
+    execution = await executor.execute_workflow(workflow, {"input": 1})
+
+    assert execution.status == "FAILED"
+    assert "notify" in execution.error
+
+
+@pytest.mark.asyncio
+async def test_execute_workflow_drops_checkpoints(executor):
+    execution = await executor.execute_workflow(_two_branch_workflow(), {"input": 1})
+
+    config = {"configurable": {"thread_id": execution.id}}
+    assert await executor._checkpointer.aget_tuple(config) is None
+
+
+@pytest.mark.asyncio
+async def test_graph_cache_evicts_least_recently_used(executor, monkeypatch):
+    monkeypatch.setattr("app.workflow_engine.executor.MAX_CACHED_GRAPHS", 2)
+    first, second, third = (_two_branch_workflow() for _ in range(3))
+
+    await executor.execute_workflow(first, {"input": 1})
+    await executor.execute_workflow(second, {"input": 1})
+    await executor.execute_workflow(first, {"input": 1})
+    await executor.execute_workflow(third, {"input": 1})
+
+    assert list(executor._graph_cache) == [(first.id, first.version), (third.id, third.version)]
+
+
+@pytest.mark.asyncio
+async def test_build_state_graph_rejects_loops(executor):
+    workflow = _two_branch_workflow()
+    workflow.steps[-1]["next_steps"] = ["left"]
+
+    with pytest.raises(ValueError, match="loop"):
+        await executor._build_state_graph(workflow)